@@ -1,7 +1,7 @@
 """API route definitions."""
 
 from typing import List
-from datetime import datetime, timezone, timezone, timedelta
+from datetime import datetime, timezone, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from uuid import UUID
 from loguru import logger
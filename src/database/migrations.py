@@ -193,6 +193,22 @@ CREATE TRIGGER update_subscriptions_updated_at BEFORE UPDATE ON subscriptions
 
 CREATE TRIGGER update_leads_updated_at BEFORE UPDATE ON lead_scores
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Bulk next_billing_date update used by the billing run
+CREATE OR REPLACE FUNCTION bulk_update_next_billing(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE subscriptions AS s
+    SET next_billing_date = u.next_billing_date
+    FROM jsonb_to_recordset(updates) AS u(id UUID, next_billing_date TIMESTAMPTZ)
+    WHERE s.id = u.id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ language 'plpgsql';
 """
 
 
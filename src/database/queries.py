@@ -1,8 +1,8 @@
 """Database query abstractions."""
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
-from datetime import datetime, timezone, timezone, timedelta
+from datetime import datetime, timezone, timedelta
 from loguru import logger
 
 from .supabase import get_supabase_client
@@ -58,6 +58,16 @@ class UserQueries:
             logger.error(f"Get user error: {e}")
             return None
 
+    def get_users_by_ids(self, user_ids: List[UUID]) -> List[User]:
+        """Get users for several IDs in a single query."""
+        try:
+            ids = list({str(user_id) for user_id in user_ids})
+            users = self.db.select_in("users", "id", ids)
+            return [User(**u) for u in users]
+        except Exception as e:
+            logger.error(f"Get users error: {e}")
+            return []
+
     def update_user(self, user_id: UUID, updates: Dict) -> Optional[User]:
         """Update user."""
         try:
@@ -134,6 +144,45 @@ class SubscriptionQueries:
             logger.error(f"Subscription update error: {e}")
             return None
 
+    def bulk_update_next_billing(self, updates: List[Tuple[UUID, datetime]]) -> int:
+        """
+        Set next_billing_date for many subscriptions in one transaction.
+
+        Falls back to one update per subscription when the
+        ``bulk_update_next_billing`` RPC is missing or fails.
+
+        Args:
+            updates: (subscription_id, next_billing_date) pairs
+
+        Returns:
+            Number of subscriptions updated
+        """
+        if not updates:
+            return 0
+
+        try:
+            rows = [
+                {"id": str(sub_id), "next_billing_date": next_billing.isoformat()}
+                for sub_id, next_billing in updates
+            ]
+            result = self.db.execute_rpc("bulk_update_next_billing", {"updates": rows})
+            if result is None:
+                # RPC missing (migration not applied) or failed: update per row
+                updated = sum(
+                    1
+                    for row in rows
+                    if self.update_subscription(
+                        row["id"], {"next_billing_date": row["next_billing_date"]}
+                    )
+                )
+            else:
+                updated = int(result)
+            logger.info(f"Next billing date updated for {updated} subscriptions")
+            return updated
+        except Exception as e:
+            logger.error(f"Bulk subscription update error: {e}")
+            return 0
+
     def get_due_subscriptions(self) -> List[Subscription]:
         """Get subscriptions due for billing."""
         try:
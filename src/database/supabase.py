@@ -147,6 +147,44 @@ class SupabaseClient:
             logger.error(f"Select error from {table_name}: {e}")
             return []
 
+    def select_in(
+        self,
+        table_name: str,
+        column: str,
+        values: List,
+        columns: str = "*",
+    ) -> List[Dict]:
+        """
+        Select rows whose column matches any of the given values.
+
+        Args:
+            table_name: Table name
+            column: Column to match
+            values: Values to match (single IN query)
+            columns: Columns to select
+
+        Returns:
+            List of rows
+
+        Example:
+            >>> users = client.select_in("users", "id", [id1, id2])
+        """
+        if not self.client:
+            logger.warning("Supabase client not available")
+            return []
+
+        if not values:
+            return []
+
+        try:
+            table = self.get_table(table_name)
+            result = table.select(columns).in_(column, values).execute()
+            return result.data if result.data else []
+
+        except Exception as e:
+            logger.error(f"Select error from {table_name}: {e}")
+            return []
+
     def update(
         self,
         table_name: str,
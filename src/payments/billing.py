@@ -6,13 +6,15 @@ from uuid import UUID
 from loguru import logger
 
 from ..database.queries import SubscriptionQueries, UserQueries
-from ..database.models import Subscription, Payment
+from ..database.models import Subscription, Payment, User
 from .payfast import PayFastClient
 
 
 class BillingService:
     """Automated billing service."""
 
+    __slots__ = ("sub_queries", "user_queries", "payfast")
+
     def __init__(self):
         """Initialize billing service."""
         self.sub_queries = SubscriptionQueries()
@@ -33,11 +35,37 @@ class BillingService:
         """
         try:
             due_subs = self.sub_queries.get_due_subscriptions()
-            processed = 0
-
+            if not due_subs:
+                logger.info("No subscriptions due for billing")
+                return 0
+
+            # One query for every user instead of one per subscription
+            users = {
+                user.id: user
+                for user in self.user_queries.get_users_by_ids(
+                    [sub.user_id for sub in due_subs]
+                )
+            }
+
+            renewals = []
             for sub in due_subs:
-                if self.process_subscription_renewal(sub):
-                    processed += 1
+                user = users.get(sub.user_id)
+                if not user:
+                    logger.error(f"User not found for subscription: {sub.id}")
+                    continue
+
+                # One failing subscription must not stop the rest of the run
+                try:
+                    self._create_renewal_payment(sub, user)
+                    next_billing = sub.next_billing_date + timedelta(days=30)
+                except Exception as e:
+                    logger.error(f"Subscription renewal error for {sub.id}: {e}")
+                    continue
+
+                renewals.append((sub.id, next_billing))
+
+            # Single bulk update for all next billing dates
+            processed = self.sub_queries.bulk_update_next_billing(renewals)
 
             logger.info(
                 f"Processed {processed}/{len(due_subs)} subscriptions",
@@ -59,17 +87,7 @@ class BillingService:
                 logger.error(f"User not found for subscription: {subscription.id}")
                 return False
 
-            # Generate payment URL
-            payment_url = self.payfast.create_subscription_payment(
-                user_id=str(user.id),
-                plan=subscription.plan,
-                amount=float(subscription.monthly_fee),
-                email=user.email,
-                name=user.name or "",
-            )
-
-            # Send payment link via email/notification
-            # This would integrate with communication channels
+            self._create_renewal_payment(subscription, user)
 
             # Update next billing date
             next_billing = subscription.next_billing_date + timedelta(days=30)
@@ -88,3 +106,18 @@ class BillingService:
         except Exception as e:
             logger.error(f"Subscription renewal error: {e}")
             return False
+
+    def _create_renewal_payment(self, subscription: Subscription, user: User) -> str:
+        """Generate the renewal payment URL for a subscription."""
+        payment_url = self.payfast.create_subscription_payment(
+            user_id=str(user.id),
+            plan=subscription.plan,
+            amount=float(subscription.monthly_fee),
+            email=user.email,
+            name=user.name or "",
+        )
+
+        # Send payment link via email/notification
+        # This would integrate with communication channels
+
+        return payment_url
@@ -1,7 +1,8 @@
 """PayFast payment integration for South Africa."""
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import hashlib
+import hmac
 import urllib.parse
 from loguru import logger
 
@@ -13,6 +14,16 @@ settings = get_settings()
 class PayFastClient:
     """PayFast payment gateway client."""
 
+    __slots__ = (
+        "merchant_id",
+        "merchant_key",
+        "passphrase",
+        "sandbox",
+        "base_url",
+        "_passphrase_suffix",
+        "_static_params",
+    )
+
     def __init__(
         self,
         merchant_id: Optional[str] = None,
@@ -44,6 +55,17 @@ class PayFastClient:
             else "https://www.payfast.co.za/eng/process"
         )
 
+        # Fields that never change per instance are encoded once
+        self._passphrase_suffix = (
+            f"&passphrase={urllib.parse.quote_plus(self.passphrase)}"
+            if self.passphrase
+            else ""
+        )
+        self._static_params = {
+            "merchant_id": self.merchant_id,
+            "merchant_key": self.merchant_key,
+        }
+
         logger.info(
             f"PayFast initialized: {'sandbox' if self.sandbox else 'production'}",
             extra={"sandbox": self.sandbox},
@@ -59,18 +81,31 @@ class PayFastClient:
         Returns:
             MD5 signature string
         """
-        # Create parameter string
-        param_string = "&".join(f"{k}={urllib.parse.quote_plus(str(v))}" for k, v in sorted(data.items()))
+        return self._sign(data)[1]
+
+    def _sign(self, data: Dict) -> Tuple[str, str]:
+        """
+        Build the encoded parameter string and its signature in one pass.
+
+        Args:
+            data: Payment data dictionary
+
+        Returns:
+            Tuple of (URL-encoded parameter string, MD5 signature)
+        """
+        # Create parameter string (same encoding is reused for the payment URL)
+        param_string = urllib.parse.urlencode(
+            sorted(data.items()), quote_via=urllib.parse.quote_plus
+        )
 
         # Add passphrase if configured
-        if self.passphrase:
-            param_string += f"&passphrase={urllib.parse.quote_plus(self.passphrase)}"
+        signing_string = param_string + self._passphrase_suffix
 
         # Generate signature
-        signature = hashlib.md5(param_string.encode()).hexdigest()
+        signature = hashlib.md5(signing_string.encode()).hexdigest()
 
         logger.debug(f"Generated signature: {signature}")
-        return signature
+        return param_string, signature
 
     def generate_payment_url(
         self,
@@ -109,8 +144,7 @@ class PayFastClient:
             ... )
         """
         data = {
-            "merchant_id": self.merchant_id,
-            "merchant_key": self.merchant_key,
+            **self._static_params,
             "amount": f"{amount:.2f}",
             "item_name": item_name,
         }
@@ -131,11 +165,11 @@ class PayFastClient:
         if notify_url:
             data["notify_url"] = notify_url
 
-        # Generate signature
-        data["signature"] = self.generate_signature(data)
+        # Generate signature, reusing the encoded fields for the query string
+        param_string, signature = self._sign(data)
 
         # Build URL
-        query_string = urllib.parse.urlencode(data)
+        query_string = f"{param_string}&signature={signature}"
         payment_url = f"{self.base_url}?{query_string}"
 
         logger.info(
@@ -168,8 +202,8 @@ class PayFastClient:
             # Generate expected signature
             expected_signature = self.generate_signature(data)
 
-            # Verify
-            is_valid = signature == expected_signature
+            # Verify (constant-time to avoid leaking signature prefixes)
+            is_valid = hmac.compare_digest(signature, expected_signature)
 
             if is_valid:
                 logger.info(
@@ -209,11 +243,13 @@ class PayFastClient:
         Returns:
             Payment URL
         """
+        name_parts = name.split()
+
         return self.generate_payment_url(
             amount=amount,
             item_name=f"{plan.capitalize()} Plan Subscription",
             item_description=f"Monthly subscription to {plan} plan",
             email_address=email,
-            name_first=name.split()[0] if name else "",
-            name_last=" ".join(name.split()[1:]) if len(name.split()) > 1 else "",
+            name_first=name_parts[0] if name_parts else "",
+            name_last=" ".join(name_parts[1:]),
         )
@@ -8,10 +8,15 @@ from loguru import logger
 from ..database.queries import SubscriptionQueries, UserQueries
 from ..database.models import Subscription, User
 
+# Fields shared by every new subscription
+_SUB_TEMPLATE = {"currency": "ZAR", "status": "active"}
+
 
 class SubscriptionManager:
     """Manage user subscriptions."""
 
+    __slots__ = ("sub_queries", "user_queries")
+
     def __init__(self):
         """Initialize subscription manager."""
         self.sub_queries = SubscriptionQueries()
@@ -26,15 +31,16 @@ class SubscriptionManager:
     ) -> Optional[Subscription]:
         """Create new subscription."""
         try:
-            sub_data = {
+            now = datetime.now(timezone.utc)
+            period_end = (now + timedelta(days=30)).isoformat()
+
+            sub_data = _SUB_TEMPLATE | {
                 "user_id": str(user_id),
                 "plan": plan,
                 "monthly_fee": monthly_fee,
-                "currency": "ZAR",
-                "status": "active",
-                "current_period_start": datetime.now(timezone.utc).isoformat(),
-                "current_period_end": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
-                "next_billing_date": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
+                "current_period_start": now.isoformat(),
+                "current_period_end": period_end,
+                "next_billing_date": period_end,
             }
 
             subscription = self.sub_queries.create_subscription(sub_data)
@@ -1,9 +1,13 @@
 """Quantum trading engine for high-accuracy signal generation."""
 
-from .engine import QuantumTradingEngine
-from .signal_generator import SignalGenerator
-from .mt5_connector import MT5Connector
-from .qpe import QuantumPhaseEstimator
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .engine import QuantumTradingEngine
+    from .signal_generator import SignalGenerator
+    from .mt5_connector import MT5Connector
+    from .qpe import QuantumPhaseEstimator
 
 __all__ = [
     "QuantumTradingEngine",
@@ -13,3 +17,28 @@ __all__ = [
 ]
 
 __version__ = "1.0.0"
+
+# Public name -> defining submodule. Resolved on first access (PEP 562) so that
+# e.g. importing MT5Connector does not pull in Qiskit.
+_LAZY_IMPORTS = {
+    "QuantumTradingEngine": ".engine",
+    "SignalGenerator": ".signal_generator",
+    "MT5Connector": ".mt5_connector",
+    "QuantumPhaseEstimator": ".qpe",
+}
+
+
+def __getattr__(name: str):
+    """Import public classes on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazily imported names in dir()."""
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,6 @@
 """Backtesting framework for signal validation."""
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
@@ -8,6 +8,126 @@ from loguru import logger
 
 from .signal_generator import SignalGenerator, TradingSignal
 from .mt5_connector import MT5Connector
+from ..utils._njit import njit, prange
+from ..utils._trade_scan import first_touch, TOUCH_SL, TOUCH_TP
+
+
+@njit(cache=True)
+def _scan_trade(highs, lows, closes, entry, stop_loss, take_profit, direction, size):
+    """
+    First-touch trade scan (compiled with Numba when available).
+
+    ``direction`` is 1 for BUY, -1 for SELL and 0 for anything else (no
+    SL/TP checks). A level of 0.0 means "not set". Returns
+    ``(exit_price, win, profit)``; SL wins ties on the same bar. The scan
+    itself is the shared ``first_touch`` kernel.
+    """
+    outcome, _ = first_touch(highs, lows, stop_loss, take_profit, direction)
+    if outcome == TOUCH_SL:
+        return stop_loss, False, direction * (stop_loss - entry) * size
+    if outcome == TOUCH_TP:
+        return take_profit, True, direction * (take_profit - entry) * size
+
+    close = closes[closes.shape[0] - 1]
+    if direction > 0:
+        return close, close > entry, (close - entry) * size
+    return close, close < entry, (entry - close) * size
+
+
+@njit(parallel=True, cache=True)
+def _simulate_all(
+    highs, lows, closes, starts, entries, stop_losses, take_profits, directions
+):
+    """
+    Scan every signal's trade at unit position size.
+
+    Signals read disjoint-or-overlapping slices of the same OHLC arrays and
+    never write shared state, so under Numba the loop runs across cores with
+    ``prange``. Returns ``(exits, wins, unit_profits)`` arrays aligned with
+    ``starts``.
+    """
+    n = starts.shape[0]
+    exits = np.empty(n, dtype=np.float64)
+    wins = np.empty(n, dtype=np.bool_)
+    unit_profits = np.empty(n, dtype=np.float64)
+
+    for i in prange(n):
+        s = starts[i]
+        exit_price, win, profit = _scan_trade(
+            highs[s:],
+            lows[s:],
+            closes[s:],
+            entries[i],
+            stop_losses[i],
+            take_profits[i],
+            directions[i],
+            1.0,
+        )
+        exits[i] = exit_price
+        wins[i] = win
+        unit_profits[i] = profit
+
+    return exits, wins, unit_profits
+
+
+def _compound_balances(
+    unit_profits: np.ndarray,
+    stop_distances: np.ndarray,
+    initial_balance: float,
+    risk_per_trade: float,
+    commission: float,
+) -> np.ndarray:
+    """
+    Account balance before the first trade and after each trade.
+
+    Risk-based sizing makes each step affine in the pre-trade balance,
+    ``b[k+1] = b[k] * (1 + g[k]) + a[k]``, with ``g = unit_profit * risk / stop``
+    and ``a = -commission`` (or ``g = 0``, ``a = unit_profit - commission`` for a
+    zero stop distance, which trades a fixed size of 1). The recurrence unrolls
+    to ``b[n] = P[n] * (b[0] + sum(a[k] / P[k + 1]))`` with ``P`` the running
+    product of growth factors, so it is solved with cumprod/cumsum. A plain loop
+    is used if ``P`` hits zero or leaves the finite range.
+
+    Args:
+        unit_profits: Profit of each trade at position size 1
+        stop_distances: Entry-to-stop distance of each trade
+        initial_balance: Starting account balance
+        risk_per_trade: Fraction of balance risked per trade
+        commission: Flat commission per trade
+
+    Returns:
+        Array of ``len(unit_profits) + 1`` balances
+    """
+    sized = stop_distances > 0
+    growth = np.where(
+        sized, unit_profits * risk_per_trade / np.where(sized, stop_distances, 1.0), 0.0
+    )
+    offsets = np.where(sized, 0.0, unit_profits) - commission
+
+    factors = np.cumprod(1.0 + growth)
+    if np.all(np.isfinite(factors)) and np.all(factors != 0.0):
+        scaled = np.cumsum(offsets / factors)
+        balances = np.empty(len(unit_profits) + 1, dtype=np.float64)
+        balances[0] = initial_balance
+        balances[1:] = factors * (initial_balance + scaled)
+        return balances
+
+    balances = np.empty(len(unit_profits) + 1, dtype=np.float64)
+    balances[0] = initial_balance
+    for k in range(len(unit_profits)):
+        balances[k + 1] = balances[k] * (1.0 + growth[k]) + offsets[k]
+    return balances
+
+
+_DIRECTIONS = {"BUY": 1, "SELL": -1}
+
+
+def _as_price(value) -> float:
+    """Convert a signal price level to float, NaN if missing or non-numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
 
 
 class Backtester:
@@ -68,57 +188,100 @@ class Backtester:
         """
         logger.info(f"Running backtest on {len(signals)} signals...")
 
-        balance = self.initial_balance
-        trades = []
-        equity_curve = [balance]
+        # Index bars by time once; each signal then binary-searches its start
+        if not price_data["time"].is_monotonic_increasing:
+            price_data = price_data.sort_values("time", kind="stable")
+        times = pd.DatetimeIndex(price_data["time"])
+        highs = price_data["high"].to_numpy(dtype=np.float64)
+        lows = price_data["low"].to_numpy(dtype=np.float64)
+        closes = price_data["close"].to_numpy(dtype=np.float64)
+        n_bars = len(times)
+
+        # Trade levels and stop distances for every signal as arrays
+        # (a missing or non-numeric price becomes NaN and marks the signal invalid)
+        n_signals = len(signals)
+        entries = np.array([_as_price(s.entry_price) for s in signals])
+        stop_levels = np.array([_as_price(s.stop_loss) for s in signals])
+        take_profits = np.array([_as_price(s.take_profit or 0.0) for s in signals])
+        directions = np.array(
+            [_DIRECTIONS.get(s.action, 0) for s in signals], dtype=np.int64
+        )
+        stop_distances = np.abs(entries - stop_levels)
+        stop_losses = np.nan_to_num(stop_levels, nan=0.0)
+        priced = np.isfinite(stop_distances) & np.isfinite(take_profits)
 
-        for signal in signals:
-            try:
-                # Get future data after signal
-                signal_time = signal.timestamp
-                future_data = price_data[price_data["time"] > signal_time]
-
-                if len(future_data) < 10:
-                    logger.debug(f"Insufficient future data for {signal.symbol}")
-                    continue
-
-                # Calculate position size
-                risk_amount = balance * self.risk_per_trade
-                stop_distance = abs(signal.entry_price - signal.stop_loss)
-                position_size = risk_amount / stop_distance if stop_distance > 0 else 1.0
-
-                # Simulate trade
-                trade_result = self._simulate_trade(
-                    signal=signal,
-                    future_data=future_data,
-                    position_size=position_size,
-                )
-
-                if trade_result:
-                    # Update balance
-                    profit = trade_result["profit"] - self.commission
-                    balance += profit
-
-                    trades.append(
-                        {
-                            "symbol": signal.symbol,
-                            "action": signal.action,
-                            "entry": signal.entry_price,
-                            "exit": trade_result["exit"],
-                            "profit": profit,
-                            "profit_pct": (profit / balance) * 100,
-                            "win": trade_result["win"],
-                            "timestamp": signal.timestamp,
-                        }
-                    )
-
-                    equity_curve.append(balance)
+        # Resolve every signal's first bar strictly after it in one search
+        try:
+            starts = times.searchsorted(
+                pd.DatetimeIndex([s.timestamp for s in signals]), side="right"
+            )
+        except Exception as e:
+            # e.g. mixed timezones: fall back to resolving signals one by one
+            logger.debug(f"Batch signal lookup failed ({e}), resolving individually")
+            starts = self._resolve_starts(times, signals)
+
+        # Keep signals with enough future bars and complete price levels
+        has_future = n_bars - starts >= 10
+        valid = has_future & priced
+
+        if not has_future.all():
+            logger.debug(
+                f"Insufficient future data for {n_signals - has_future.sum()} signals"
+            )
+        unpriced = has_future & ~priced
+        if unpriced.any():
+            logger.warning(
+                f"Skipped {unpriced.sum()} signals with missing or non-numeric"
+                " entry price, stop loss or take profit"
+            )
+
+        # Simulate all trades at unit size (parallel across signals)
+        idx = np.flatnonzero(valid)
+        exits, wins, unit_profits = _simulate_all(
+            highs,
+            lows,
+            closes,
+            starts[idx],
+            entries[idx],
+            stop_losses[idx],
+            take_profits[idx],
+            directions[idx],
+        )
 
-            except Exception as e:
-                logger.error(f"Backtest error for signal {signal.symbol}: {e}")
+        # Compound the balance, then size each trade from its pre-trade balance
+        trade_stops = stop_distances[idx]
+        balances = _compound_balances(
+            unit_profits,
+            trade_stops,
+            self.initial_balance,
+            self.risk_per_trade,
+            self.commission,
+        )
+        sized = trade_stops > 0
+        position_sizes = np.where(
+            sized,
+            balances[:-1] * self.risk_per_trade / np.where(sized, trade_stops, 1.0),
+            1.0,
+        )
+        profits = unit_profits * position_sizes - self.commission
+        profit_pcts = profits / balances[1:] * 100
+
+        trades: List[Optional[Dict]] = [None] * len(idx)
+        for k, i in enumerate(idx):
+            signal = signals[i]
+            trades[k] = {
+                "symbol": signal.symbol,
+                "action": signal.action,
+                "entry": signal.entry_price,
+                "exit": exits[k],
+                "profit": profits[k],
+                "profit_pct": profit_pcts[k],
+                "win": wins[k],
+                "timestamp": signal.timestamp,
+            }
 
-        # Calculate statistics
-        results = self._calculate_statistics(trades, equity_curve)
+        # Calculate statistics (the balance array is the equity curve)
+        results = self._calculate_statistics(trades, balances)
 
         logger.info(
             f"Backtest complete: {results['total_trades']} trades, {results['win_rate']:.2%} win rate",
@@ -127,73 +290,36 @@ class Backtester:
 
         return results
 
-    def _simulate_trade(
-        self,
-        signal: TradingSignal,
-        future_data: pd.DataFrame,
-        position_size: float,
-    ) -> Optional[Dict]:
+    def _resolve_starts(
+        self, times: pd.DatetimeIndex, signals: List[TradingSignal]
+    ) -> np.ndarray:
         """
-        Simulate individual trade execution.
+        Find each signal's first bar index, one signal at a time.
+
+        Signals whose timestamp cannot be compared with the bar index are
+        logged and mapped past the last bar so they are skipped.
 
         Args:
-            signal: Trading signal
-            future_data: Future price data
-            position_size: Position size
+            times: Bar timestamps (sorted)
+            signals: Signals to locate
 
         Returns:
-            Trade result or None
+            Array of start indices aligned with ``signals``
         """
-        try:
-            entry = signal.entry_price
-            stop_loss = signal.stop_loss
-            take_profit = signal.take_profit
-
-            for idx, row in future_data.iterrows():
-                high = row["high"]
-                low = row["low"]
-                close = row["close"]
-
-                if signal.action == "BUY":
-                    # Check if SL hit
-                    if stop_loss and low <= stop_loss:
-                        profit = (stop_loss - entry) * position_size
-                        return {"exit": stop_loss, "win": False, "profit": profit}
-
-                    # Check if TP hit
-                    if take_profit and high >= take_profit:
-                        profit = (take_profit - entry) * position_size
-                        return {"exit": take_profit, "win": True, "profit": profit}
-
-                elif signal.action == "SELL":
-                    # Check if SL hit
-                    if stop_loss and high >= stop_loss:
-                        profit = (entry - stop_loss) * position_size
-                        return {"exit": stop_loss, "win": False, "profit": profit}
-
-                    # Check if TP hit
-                    if take_profit and low <= take_profit:
-                        profit = (entry - take_profit) * position_size
-                        return {"exit": take_profit, "win": True, "profit": profit}
-
-            # Exit at last close if no TP/SL hit
-            if signal.action == "BUY":
-                profit = (close - entry) * position_size
-                win = close > entry
-            else:
-                profit = (entry - close) * position_size
-                win = close < entry
-
-            return {"exit": close, "win": win, "profit": profit}
+        starts = np.full(len(signals), len(times), dtype=np.int64)
 
-        except Exception as e:
-            logger.error(f"Trade simulation error: {e}")
-            return None
+        for i, signal in enumerate(signals):
+            try:
+                starts[i] = times.searchsorted(signal.timestamp, side="right")
+            except Exception as e:
+                logger.error(f"Backtest error for signal {signal.symbol}: {e}")
+
+        return starts
 
     def _calculate_statistics(
         self,
         trades: List[Dict],
-        equity_curve: List[float],
+        equity_curve: Union[List[float], np.ndarray],
     ) -> Dict:
         """
         Calculate backtest statistics.
@@ -213,35 +339,40 @@ class Backtester:
                 "max_drawdown": 0.0,
             }
 
-        wins = [t for t in trades if t["win"]]
-        losses = [t for t in trades if not t["win"]]
-
-        total_profit = sum(t["profit"] for t in trades)
-        avg_win = np.mean([t["profit"] for t in wins]) if wins else 0
-        avg_loss = np.mean([t["profit"] for t in losses]) if losses else 0
-
-        # Calculate max drawdown
-        peak = equity_curve[0]
-        max_drawdown = 0
-        for equity in equity_curve:
-            if equity > peak:
-                peak = equity
-            drawdown = (peak - equity) / peak
-            max_drawdown = max(max_drawdown, drawdown)
-
-        # Sharpe ratio (simplified)
-        returns = np.diff(equity_curve) / equity_curve[:-1]
-        sharpe = (
-            np.mean(returns) / np.std(returns) * np.sqrt(252)
-            if len(returns) > 0 and np.std(returns) > 0
-            else 0
+        # Column arrays built in one pass over the trades
+        n_trades = len(trades)
+        profits = np.fromiter(
+            (t["profit"] for t in trades), dtype=np.float64, count=n_trades
         )
+        wins = np.fromiter((t["win"] for t in trades), dtype=bool, count=n_trades)
+
+        winning_trades = int(wins.sum())
+        losing_trades = n_trades - winning_trades
+
+        total_profit = float(profits.sum())
+        avg_win = profits[wins].mean() if winning_trades else 0
+        avg_loss = profits[~wins].mean() if losing_trades else 0
+
+        # Calculate max drawdown against the running peak
+        eq = np.asarray(equity_curve, dtype=np.float64)
+        peaks = np.maximum.accumulate(eq)
+        max_drawdown = float(((peaks - eq) / peaks).max())
+
+        # Sharpe ratio (simplified); mean and std share one centred pass
+        returns = np.diff(eq) / eq[:-1]
+        sharpe = 0
+        if len(returns) > 0:
+            mean_return = returns.mean()
+            centred = returns - mean_return
+            std_return = np.sqrt(np.dot(centred, centred) / len(returns))
+            if std_return > 0:
+                sharpe = mean_return / std_return * np.sqrt(252)
 
         return {
-            "total_trades": len(trades),
-            "winning_trades": len(wins),
-            "losing_trades": len(losses),
-            "win_rate": len(wins) / len(trades) if trades else 0,
+            "total_trades": n_trades,
+            "winning_trades": winning_trades,
+            "losing_trades": losing_trades,
+            "win_rate": winning_trades / n_trades,
             "total_profit": total_profit,
             "total_profit_pct": (total_profit / self.initial_balance) * 100,
             "avg_win": avg_win,
@@ -250,9 +381,9 @@ class Backtester:
             "max_drawdown": max_drawdown,
             "max_drawdown_pct": max_drawdown * 100,
             "sharpe_ratio": sharpe,
-            "final_balance": equity_curve[-1] if equity_curve else self.initial_balance,
+            "final_balance": float(eq[-1]) if len(eq) else self.initial_balance,
             "trades": trades,
-            "equity_curve": equity_curve,
+            "equity_curve": eq.tolist(),
         }
 
     def run_historical_validation(
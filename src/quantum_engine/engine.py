@@ -1,7 +1,8 @@
 """Main Quantum Trading Engine orchestrating all components."""
 
 from typing import List, Optional, Dict
-from datetime import datetime, timezone, timezone
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -179,22 +180,14 @@ class QuantumTradingEngine:
         signals = []
         symbols_data = {}
 
-        # Collect data for all symbols
+        # Collect data for all symbols (MT5 terminal calls are serialized, so
+        # fetching from threads would only queue on the connector lock)
         for symbol in self.symbols:
-            try:
-                data = self.mt5.get_rates(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    count=self.lookback_period + 50,
-                )
-
-                if data is not None and len(data) >= self.lookback_period:
-                    symbols_data[symbol] = data
-                else:
-                    logger.warning(f"Skipping {symbol}: insufficient data")
-
-            except Exception as e:
-                logger.error(f"Error getting data for {symbol}: {e}")
+            data = self._fetch_rates(symbol, timeframe)
+            if data is not None and len(data["close"]) >= self.lookback_period:
+                symbols_data[symbol] = data
+            else:
+                logger.warning(f"Skipping {symbol}: insufficient data")
 
         # Generate signals in batch
         if symbols_data:
@@ -211,6 +204,30 @@ class QuantumTradingEngine:
 
         return signals
 
+    def _fetch_rates(
+        self, symbol: str, timeframe: str
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Fetch analysis window for one symbol as NumPy column arrays.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Analysis timeframe
+
+        Returns:
+            Dict of OHLCV column arrays or None on error
+        """
+        try:
+            return self.mt5.get_rates_arrays(
+                symbol=symbol,
+                timeframe=timeframe,
+                count=self.lookback_period + 50,
+            )
+
+        except Exception as e:
+            logger.error(f"Error getting data for {symbol}: {e}")
+            return None
+
     def get_market_summary(self) -> Dict:
         """
         Get current market summary.
@@ -315,7 +332,7 @@ class QuantumTradingEngine:
 
         # Test signal generation with mock data
         try:
-            test_data = self.mt5._generate_mock_data("EURUSD", 100)
+            test_data = self.mt5._generate_mock_arrays("EURUSD", 100)
             test_signal = self.signal_generator.generate(test_data, "EURUSD")
             validation["signal_generation_working"] = test_signal is not None
         except Exception as e:
@@ -1,7 +1,11 @@
 """MetaTrader 5 connector for real-time market data."""
 
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple, Union
+from datetime import datetime, timedelta, timezone
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -12,6 +16,46 @@ except ImportError:
     logger.warning("MetaTrader5 not installed - using mock data")
     MT5_AVAILABLE = False
 
+# Timeframe string -> MT5 constant, resolved once at import
+_TIMEFRAME_MAP = (
+    {
+        "M1": mt5.TIMEFRAME_M1,
+        "M5": mt5.TIMEFRAME_M5,
+        "M15": mt5.TIMEFRAME_M15,
+        "M30": mt5.TIMEFRAME_M30,
+        "H1": mt5.TIMEFRAME_H1,
+        "H4": mt5.TIMEFRAME_H4,
+        "D1": mt5.TIMEFRAME_D1,
+    }
+    if MT5_AVAILABLE
+    else {}
+)
+
+# Bar length per timeframe, used to decide whether cached rates are current
+_TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+}
+
+# On-disk rates cache (pickled DataFrames), capped per symbol/timeframe
+_RATES_CACHE_DIR = Path.home() / ".quantum_engine_cache"
+_RATES_CACHE_MAX_BARS = 10_000
+
+# Symbols offered in mock mode
+_MOCK_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY", "XAUUSD")
+
+# Shared generator for mock data (PCG64)
+_RNG = np.random.default_rng()
+
+# Per-bar OHLC noise bounds: open jitter, high extension, low extension
+_MOCK_NOISE_LOW = np.array([-0.0001, 0.0, 0.0])
+_MOCK_NOISE_HIGH = np.array([0.0001, 0.0005, 0.0005])
+
 
 class MT5Connector:
     """
@@ -20,12 +64,18 @@ class MT5Connector:
     Handles connection, data retrieval, and error recovery.
     """
 
+    # The MetaTrader5 package drives one terminal connection per process and
+    # does not document thread safety, so every IPC call is serialized
+    _mt5_lock = threading.Lock()
+
     def __init__(
         self,
         login: Optional[int] = None,
         password: Optional[str] = None,
         server: Optional[str] = None,
         timeout: int = 60000,
+        cache_ttl: float = 0.25,
+        cache_dir: Optional[Union[str, Path]] = None,
     ):
         """
         Initialize MT5 connector.
@@ -35,6 +85,8 @@ class MT5Connector:
             password: MT5 account password
             server: Broker server name
             timeout: Connection timeout in milliseconds
+            cache_ttl: Seconds a fetched tick is reused by get_current_price
+            cache_dir: Directory for cached rates (default: ~/.quantum_engine_cache)
 
         Example:
             >>> connector = MT5Connector(login=12345, password="pass", server="Broker-Server")
@@ -45,6 +97,11 @@ class MT5Connector:
         self.server = server
         self.timeout = timeout
         self.connected = False
+        self.cache_ttl = cache_ttl
+        self._tick_cache: Dict[str, Tuple[float, Dict]] = {}
+        self.cache_dir = Path(cache_dir) if cache_dir else _RATES_CACHE_DIR
+        self._symbols_cache: Optional[List[str]] = None
+        self._symbols_set: Optional[frozenset] = None
 
         logger.info("MT5Connector initialized", extra={"mt5_available": MT5_AVAILABLE})
 
@@ -65,25 +122,28 @@ class MT5Connector:
             return False
 
         try:
-            # Initialize MT5
-            if not mt5.initialize():
-                logger.error(f"MT5 initialization failed: {mt5.last_error()}")
-                return False
-
-            # Login if credentials provided
-            if self.login and self.password and self.server:
-                authorized = mt5.login(
-                    login=self.login,
-                    password=self.password,
-                    server=self.server,
-                    timeout=self.timeout,
-                )
-
-                if not authorized:
-                    logger.error(f"MT5 login failed: {mt5.last_error()}")
-                    mt5.shutdown()
+            with self._mt5_lock:
+                # Initialize MT5
+                if not mt5.initialize():
+                    logger.error(f"MT5 initialization failed: {mt5.last_error()}")
                     return False
 
+                # Login if credentials provided
+                authorized = None
+                if self.login and self.password and self.server:
+                    authorized = mt5.login(
+                        login=self.login,
+                        password=self.password,
+                        server=self.server,
+                        timeout=self.timeout,
+                    )
+
+                    if not authorized:
+                        logger.error(f"MT5 login failed: {mt5.last_error()}")
+                        mt5.shutdown()
+                        return False
+
+            if authorized:
                 logger.info(
                     f"MT5 connected: {self.login}@{self.server}",
                     extra={"login": self.login, "server": self.server},
@@ -107,8 +167,12 @@ class MT5Connector:
             >>> connector.disconnect()
         """
         if MT5_AVAILABLE and self.connected:
-            mt5.shutdown()
+            with self._mt5_lock:
+                mt5.shutdown()
             self.connected = False
+            self._tick_cache.clear()
+            self._symbols_cache = None
+            self._symbols_set = None
             logger.info("MT5 disconnected")
 
     def get_rates(
@@ -116,6 +180,7 @@ class MT5Connector:
         symbol: str,
         timeframe: str = "H1",
         count: int = 100,
+        use_cache: bool = False,
     ) -> Optional[pd.DataFrame]:
         """
         Get historical rates for symbol.
@@ -124,6 +189,9 @@ class MT5Connector:
             symbol: Trading symbol (e.g., "EURUSD")
             timeframe: Timeframe (M1, M5, M15, M30, H1, H4, D1)
             count: Number of bars to retrieve
+            use_cache: Serve from / update the on-disk rates cache. The cache is
+                reused while its last bar is still the current bar, so leave
+                this off where the forming bar's latest close matters.
 
         Returns:
             DataFrame with OHLCV data or None
@@ -137,29 +205,23 @@ class MT5Connector:
             return self._generate_mock_data(symbol, count)
 
         try:
-            # Map timeframe string to MT5 constant
-            timeframe_map = {
-                "M1": mt5.TIMEFRAME_M1,
-                "M5": mt5.TIMEFRAME_M5,
-                "M15": mt5.TIMEFRAME_M15,
-                "M30": mt5.TIMEFRAME_M30,
-                "H1": mt5.TIMEFRAME_H1,
-                "H4": mt5.TIMEFRAME_H4,
-                "D1": mt5.TIMEFRAME_D1,
-            }
-
-            tf = timeframe_map.get(timeframe, mt5.TIMEFRAME_H1)
-
-            # Get rates
-            rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
-
-            if rates is None or len(rates) == 0:
-                logger.error(f"No rates for {symbol}: {mt5.last_error()}")
+            if use_cache:
+                cached = self._read_rates_cache(symbol, timeframe, count)
+                if cached is not None:
+                    logger.debug(f"Rates cache hit for {symbol} {timeframe}")
+                    return cached
+
+            rates = self._copy_rates(symbol, timeframe, count)
+            if rates is None:
                 return None
 
-            # Convert to DataFrame
-            df = pd.DataFrame(rates)
-            df["time"] = pd.to_datetime(df["time"], unit="s")
+            # Build columns straight from the structured array's field views
+            columns = {name: rates[name] for name in rates.dtype.names}
+            columns["time"] = pd.to_datetime(rates["time"], unit="s", utc=True)
+            df = pd.DataFrame(columns, copy=False)
+
+            if use_cache:
+                self._write_rates_cache(symbol, timeframe, df)
 
             logger.info(
                 f"Retrieved {len(df)} bars for {symbol} {timeframe}",
@@ -172,6 +234,147 @@ class MT5Connector:
             logger.error(f"Error getting rates for {symbol}: {e}")
             return None
 
+    def get_rates_arrays(
+        self,
+        symbol: str,
+        timeframe: str = "H1",
+        count: int = 100,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get historical rates as NumPy column arrays, without building a DataFrame.
+
+        Args:
+            symbol: Trading symbol (e.g., "EURUSD")
+            timeframe: Timeframe (M1, M5, M15, M30, H1, H4, D1)
+            count: Number of bars to retrieve
+
+        Returns:
+            Dict of column name -> ndarray ("time" as UTC-naive datetime64) or None
+
+        Example:
+            >>> bars = connector.get_rates_arrays("EURUSD", "H1", 100)
+            >>> print(bars["close"][-5:])
+        """
+        if not MT5_AVAILABLE or not self.connected:
+            logger.warning("MT5 not connected - returning mock data")
+            return self._generate_mock_arrays(symbol, count)
+
+        try:
+            rates = self._copy_rates(symbol, timeframe, count)
+            if rates is None:
+                return None
+
+            arrays = {name: rates[name] for name in rates.dtype.names}
+            arrays["time"] = rates["time"].astype("datetime64[s]")
+            return arrays
+
+        except Exception as e:
+            logger.error(f"Error getting rates for {symbol}: {e}")
+            return None
+
+    def _copy_rates(
+        self, symbol: str, timeframe: str, count: int
+    ) -> Optional[np.ndarray]:
+        """
+        Fetch the raw MT5 rates structured array.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            count: Number of bars to retrieve
+
+        Returns:
+            Structured ndarray of bars or None if MT5 returned nothing
+        """
+        # Map timeframe string to MT5 constant
+        tf = _TIMEFRAME_MAP.get(timeframe, mt5.TIMEFRAME_H1)
+
+        with self._mt5_lock:
+            rates = mt5.copy_rates_from_pos(symbol, tf, 0, count)
+            empty = rates is None or len(rates) == 0
+            error = mt5.last_error() if empty else None
+
+        if empty:
+            logger.error(f"No rates for {symbol}: {error}")
+            return None
+
+        return rates
+
+    def _rates_cache_path(self, symbol: str, timeframe: str) -> Path:
+        """Cache file for a symbol/timeframe pair on the connected server."""
+        server = self.server or "default"
+        return self.cache_dir / server / f"{symbol}_{timeframe}.pkl"
+
+    def _read_rates_cache(
+        self, symbol: str, timeframe: str, count: int
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load cached rates if they hold ``count`` bars up to the current bar.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            count: Number of bars required
+
+        Returns:
+            Last ``count`` cached bars or None on a miss
+        """
+        path = self._rates_cache_path(symbol, timeframe)
+        if not path.exists():
+            return None
+
+        try:
+            df = pd.read_pickle(path)
+
+            if len(df) < count:
+                return None
+
+            bar_length = pd.Timedelta(seconds=_TIMEFRAME_SECONDS.get(timeframe, 3600))
+            if df["time"].iloc[-1] + bar_length <= datetime.now(timezone.utc):
+                return None
+
+            return df.tail(count).reset_index(drop=True)
+
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable rates cache {path}: {e}")
+            return None
+
+    def _write_rates_cache(self, symbol: str, timeframe: str, df: pd.DataFrame) -> None:
+        """
+        Merge freshly fetched bars into the cache file.
+
+        A fetch that does not overlap or adjoin the cached bars replaces the
+        file, so a cache hit never spans a gap of missing bars. Only the
+        newest ``_RATES_CACHE_MAX_BARS`` bars are kept.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            df: Bars returned by MT5 (newer rows replace cached ones)
+        """
+        path = self._rates_cache_path(symbol, timeframe)
+        bar_length = pd.Timedelta(seconds=_TIMEFRAME_SECONDS.get(timeframe, 3600))
+
+        try:
+            cached = pd.read_pickle(path) if path.exists() else None
+            if (
+                cached is not None
+                and len(cached)
+                and cached["time"].iloc[-1] + bar_length >= df["time"].iloc[0]
+            ):
+                df = (
+                    pd.concat([cached, df], ignore_index=True)
+                    .drop_duplicates("time", keep="last")
+                    .sort_values("time", kind="stable")
+                    .reset_index(drop=True)
+                )
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.tail(_RATES_CACHE_MAX_BARS).to_pickle(path)
+
+        except Exception as e:
+            logger.warning(f"Failed to update rates cache {path}: {e}")
+
     def get_current_price(self, symbol: str) -> Optional[Dict[str, float]]:
         """
         Get current bid/ask prices.
@@ -190,19 +393,29 @@ class MT5Connector:
             logger.warning("MT5 not connected - returning mock price")
             return {"bid": 1.1000, "ask": 1.1002, "spread": 0.0002}
 
+        # Reuse a tick fetched within the last cache_ttl seconds
+        now = time.monotonic()
+        cached = self._tick_cache.get(symbol)
+        if cached is not None and now - cached[0] < self.cache_ttl:
+            return dict(cached[1])
+
         try:
-            tick = mt5.symbol_info_tick(symbol)
+            with self._mt5_lock:
+                tick = mt5.symbol_info_tick(symbol)
+                error = mt5.last_error() if tick is None else None
 
             if tick is None:
-                logger.error(f"No tick for {symbol}: {mt5.last_error()}")
+                logger.error(f"No tick for {symbol}: {error}")
                 return None
 
-            return {
+            price = {
                 "bid": tick.bid,
                 "ask": tick.ask,
                 "spread": tick.ask - tick.bid,
                 "time": datetime.fromtimestamp(tick.time),
             }
+            self._tick_cache[symbol] = (now, price)
+            return dict(price)
 
         except Exception as e:
             logger.error(f"Error getting price for {symbol}: {e}")
@@ -220,20 +433,51 @@ class MT5Connector:
             >>> print(symbols[:5])
         """
         if not MT5_AVAILABLE or not self.connected:
-            return ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD"]
+            return list(_MOCK_SYMBOLS)
+
+        # Symbol list is fetched once per session
+        if self._symbols_cache is not None:
+            return list(self._symbols_cache)
 
         try:
-            symbols = mt5.symbols_get()
+            with self._mt5_lock:
+                symbols = mt5.symbols_get()
+                error = mt5.last_error() if symbols is None else None
+
             if symbols is None:
-                logger.error(f"Failed to get symbols: {mt5.last_error()}")
+                logger.error(f"Failed to get symbols: {error}")
                 return []
 
-            return [s.name for s in symbols]
+            self._symbols_cache = [s.name for s in symbols]
+            self._symbols_set = frozenset(self._symbols_cache)
+            return list(self._symbols_cache)
 
         except Exception as e:
             logger.error(f"Error getting symbols: {e}")
             return []
 
+    def is_valid_symbol(self, symbol: str) -> bool:
+        """
+        Check whether a symbol is offered by the terminal.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            True if the symbol is available
+
+        Example:
+            >>> connector.is_valid_symbol("EURUSD")
+            True
+        """
+        if not MT5_AVAILABLE or not self.connected:
+            return symbol in _MOCK_SYMBOLS
+
+        if self._symbols_set is None:
+            self.get_symbols()
+
+        return self._symbols_set is not None and symbol in self._symbols_set
+
     def _generate_mock_data(self, symbol: str, count: int) -> pd.DataFrame:
         """
         Generate mock price data for testing.
@@ -243,43 +487,48 @@ class MT5Connector:
             count: Number of bars
 
         Returns:
-            DataFrame with mock OHLCV data
+            DataFrame with mock OHLCV data (UTC-aware "time", like get_rates)
         """
-        import numpy as np
+        columns = self._generate_mock_arrays(symbol, count)
+        columns["time"] = pd.to_datetime(columns["time"], utc=True)
+        return pd.DataFrame(columns, copy=False)
 
+    def _generate_mock_arrays(self, symbol: str, count: int) -> Dict[str, np.ndarray]:
+        """
+        Generate mock price data as NumPy column arrays.
+
+        Args:
+            symbol: Trading symbol
+            count: Number of bars
+
+        Returns:
+            Dict of column name -> ndarray ("time" as UTC-naive datetime64)
+        """
         # Generate realistic price movement
         base_price = 1.1000 if "EUR" in symbol else 1.2500
         volatility = 0.001
 
-        times = pd.date_range(end=datetime.now(), periods=count, freq="h")
-        returns = np.random.normal(0, volatility, count)
+        times = pd.date_range(end=datetime.now(timezone.utc), periods=count, freq="h")
+        returns = _RNG.normal(0, volatility, count)
         close_prices = base_price * (1 + returns).cumprod()
 
-        # Generate OHLC with proper consistency
-        open_prices = np.zeros(count)
-        high_prices = np.zeros(count)
-        low_prices = np.zeros(count)
-
-        for i in range(count):
-            open_prices[i] = close_prices[i] * (1 + np.random.uniform(-0.0001, 0.0001))
-            # Ensure high is the maximum of open and close, plus a random amount
-            high_prices[i] = max(open_prices[i], close_prices[i]) * (1 + np.random.uniform(0, 0.0005))
-            # Ensure low is the minimum of open and close, minus a random amount
-            low_prices[i] = min(open_prices[i], close_prices[i]) * (1 - np.random.uniform(0, 0.0005))
-
-        df = pd.DataFrame(
-            {
-                "time": times,
-                "open": open_prices,
-                "high": high_prices,
-                "low": low_prices,
-                "close": close_prices,
-                "tick_volume": np.random.randint(100, 1000, count),
-            }
-        )
+        # Draw all OHLC noise in one call: columns are open/high/low
+        noise = _RNG.uniform(_MOCK_NOISE_LOW, _MOCK_NOISE_HIGH, size=(count, 3))
+
+        open_prices = close_prices * (1 + noise[:, 0])
+        # High is the max of open and close plus a random amount, low the min minus one
+        high_prices = np.maximum(open_prices, close_prices) * (1 + noise[:, 1])
+        low_prices = np.minimum(open_prices, close_prices) * (1 - noise[:, 2])
 
         logger.debug(f"Generated {count} mock bars for {symbol}")
-        return df
+        return {
+            "time": times.tz_localize(None).to_numpy(),
+            "open": open_prices,
+            "high": high_prices,
+            "low": low_prices,
+            "close": close_prices,
+            "tick_volume": _RNG.integers(100, 1000, count),
+        }
 
     def __enter__(self):
         """Context manager entry."""
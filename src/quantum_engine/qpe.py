@@ -1,12 +1,64 @@
 """Quantum Phase Estimation implementation using Qiskit."""
 
-from typing import List, Optional
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
+import qiskit
+import qiskit_aer
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, qpy, transpile
+from qiskit.circuit import Parameter
 from qiskit_aer import AerSimulator
 from qiskit.circuit.library import QFT
 from loguru import logger
 
+from ..utils._njit import njit, NUMBA_AVAILABLE
+
+# Transpiled QPE circuits with an unbound phase, keyed by
+# (num_qubits, backend name, exact).
+# Only the controlled-phase angles depend on the input, so the circuit is
+# transpiled once and each call just binds the phase.
+_TEMPLATE_CACHE: Dict[Tuple[int, str, bool], Tuple[QuantumCircuit, Parameter]] = {}
+
+# Transpiled templates are also persisted here (QPY) so new processes skip the
+# first transpile; the Qiskit and Aer versions are part of the file name
+_QPY_CACHE_DIR = Path.home() / ".quantum_engine_cache" / "qpe"
+
+# Bump whenever create_qpe_circuit changes so stale QPY templates are not loaded
+_QPY_TEMPLATE_VERSION = 1
+
+# Up to this many counting qubits the default backend reads exact outcome
+# probabilities from the statevector instead of sampling shots
+_EXACT_MAX_QUBITS = 8
+
+
+@njit(cache=True, error_model="numpy")
+def _encode_prices_nb(prices):
+    """
+    Streamed form of the price-to-phase encoding.
+
+    The mean of min-max normalized returns equals
+    ``(mean(r) - min(r)) / (max(r) - min(r) + 1e-10)``, so one pass keeping a
+    running sum, min and max replaces the diff/normalize/mean temporaries.
+    """
+    n = prices.shape[0]
+    lo = np.inf
+    hi = -np.inf
+    total = 0.0
+    prev = prices[0]
+
+    for i in range(1, n):
+        r = (prices[i] - prev) / prev
+        prev = prices[i]
+        total += r
+        if r < lo:
+            lo = r
+        if r > hi:
+            hi = r
+
+    mean = total / (n - 1)
+    return (mean - lo) / (hi - lo + 1e-10) * 2 * np.pi
+
 
 class QuantumPhaseEstimator:
     """
@@ -27,8 +79,10 @@ class QuantumPhaseEstimator:
 
         Args:
             num_qubits: Number of qubits for precision (4-8 recommended)
-            shots: Number of measurements for statistical confidence
-            backend: Qiskit backend name (default: AerSimulator)
+            shots: Number of measurements for statistical confidence. With the
+                default backend and num_qubits <= 8, probabilities are exact and
+                shots only sets the granularity of reported counts/confidence.
+            backend: Qiskit backend name (default: statevector AerSimulator)
 
         Example:
             >>> qpe = QuantumPhaseEstimator(num_qubits=4)
@@ -36,7 +90,20 @@ class QuantumPhaseEstimator:
         """
         self.num_qubits = num_qubits
         self.shots = shots
-        self.backend = AerSimulator() if backend is None else backend
+        self.exact = backend is None and num_qubits <= _EXACT_MAX_QUBITS
+        if backend is not None:
+            self.backend = backend
+        elif self.exact:
+            self.backend = AerSimulator(method="statevector")
+        else:
+            self.backend = AerSimulator()
+        self._backend_run = getattr(self.backend, "run", None)
+
+        # Measured integer -> phase in cycles and in radians
+        n_outcomes = 1 << num_qubits
+        self._phase_table = np.arange(n_outcomes, dtype=np.float64) / n_outcomes
+        self._phase_table_rad = self._phase_table * 2 * np.pi
+
         logger.info(
             f"QPE initialized: {num_qubits} qubits, {shots} shots",
             extra={"num_qubits": num_qubits, "shots": shots},
@@ -64,26 +131,37 @@ class QuantumPhaseEstimator:
                 logger.warning("Insufficient price data for encoding")
                 return 0.0
 
-            # Calculate returns
-            returns = np.diff(prices) / prices[:-1]
+            prices = np.asarray(prices, dtype=np.float64)
+
+            if NUMBA_AVAILABLE:
+                phase = float(_encode_prices_nb(prices))
+            else:
+                # Calculate returns
+                returns = np.diff(prices) / prices[:-1]
 
-            # Normalize returns to [0, 2π]
-            normalized = (returns - returns.min()) / (returns.max() - returns.min() + 1e-10)
-            phase = np.mean(normalized) * 2 * np.pi
+                # Mean of returns normalized to [0, 1], scaled to [0, 2π]
+                lo = returns.min()
+                phase = float(
+                    (returns.mean() - lo) / (returns.max() - lo + 1e-10) * 2 * np.pi
+                )
 
-            logger.debug(f"Encoded {len(prices)} prices to phase: {phase:.4f}")
+            logger.debug("Encoded {} prices to phase: {:.4f}", len(prices), phase)
             return phase
 
         except Exception as e:
             logger.error(f"Price encoding error: {e}")
             return 0.0
 
-    def create_qpe_circuit(self, phase: float) -> QuantumCircuit:
+    def create_qpe_circuit(
+        self, phase: Union[float, Parameter], measure: bool = True
+    ) -> QuantumCircuit:
         """
         Create QPE quantum circuit.
 
         Args:
-            phase: Target phase to estimate
+            phase: Target phase to estimate (a float or a circuit Parameter)
+            measure: Measure the counting qubits; if False, leave them
+                unmeasured (for statevector probability readout)
 
         Returns:
             Quantum circuit configured for QPE
@@ -115,8 +193,9 @@ class QuantumPhaseEstimator:
             qft_gate = QFT(self.num_qubits).inverse()
             circuit.compose(qft_gate, qubits=list(range(self.num_qubits)), inplace=True)
 
-            # Measure counting qubits
-            circuit.measure(counting_qubits, classical_bits)
+            if measure:
+                # Measure counting qubits
+                circuit.measure(counting_qubits, classical_bits)
 
             logger.debug(f"QPE circuit created: {circuit.num_qubits} qubits")
             return circuit
@@ -125,6 +204,72 @@ class QuantumPhaseEstimator:
             logger.error(f"Circuit creation error: {e}")
             raise
 
+    def _transpiled_template(self) -> Tuple[QuantumCircuit, Parameter]:
+        """
+        Get the backend-transpiled QPE circuit with an unbound phase parameter.
+
+        Returns:
+            Tuple of (transpiled circuit, phase parameter)
+        """
+        backend_name = getattr(self.backend, "name", str(self.backend))
+        key = (self.num_qubits, backend_name, self.exact)
+        cached = _TEMPLATE_CACHE.get(key)
+
+        if cached is None:
+            template = self._load_or_transpile(backend_name)
+
+            if self.exact:
+                # Aer save instructions are not QPY-serializable, so the
+                # probability readout is appended after loading
+                template.save_probabilities_dict(list(range(self.num_qubits)))
+
+            cached = (template, template.parameters[0])
+            _TEMPLATE_CACHE[key] = cached
+
+        return cached
+
+    def _load_or_transpile(self, backend_name: str) -> QuantumCircuit:
+        """
+        Load the transpiled template from the QPY cache, or build and store it.
+
+        Args:
+            backend_name: Backend name used in the cache file name
+
+        Returns:
+            Transpiled QPE circuit with an unbound phase parameter
+        """
+        mode = "exact" if self.exact else "shots"
+        path = _QPY_CACHE_DIR / (
+            f"qpe_v{_QPY_TEMPLATE_VERSION}_{self.num_qubits}q_{backend_name}_{mode}"
+            f"_qiskit{qiskit.__version__}_aer{qiskit_aer.__version__}.qpy"
+        )
+
+        if path.exists():
+            try:
+                with open(path, "rb") as f:
+                    circuit = qpy.load(f)[0]
+                logger.debug(f"QPE circuit template loaded from {path}")
+                return circuit
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable QPE template cache {path}: {e}")
+
+        circuit = self.create_qpe_circuit(Parameter("phase"), measure=not self.exact)
+
+        # Transpile circuit to backend basis gates
+        circuit = transpile(circuit, self.backend)
+        logger.debug(f"QPE circuit template transpiled for {backend_name}")
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                qpy.dump(circuit, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write QPE template cache {path}: {e}")
+
+        return circuit
+
     def estimate_phase(self, prices: List[float]) -> dict:
         """
         Estimate market phase using QPE.
@@ -143,39 +288,8 @@ class QuantumPhaseEstimator:
             # Encode prices to phase
             target_phase = self.encode_price_data(prices)
 
-            # Create and execute circuit
-            circuit = self.create_qpe_circuit(target_phase)
-
-            # Transpile circuit to backend basis gates
-            transpiled_circuit = transpile(circuit, self.backend)
-
-            job = self.backend.run(transpiled_circuit, shots=self.shots)
-            result = job.result()
-            counts = result.get_counts()
-
-            # Extract most probable phase
-            max_count = max(counts.values())
-            most_probable = [k for k, v in counts.items() if v == max_count][0]
-
-            # Convert binary to phase
-            estimated_phase = int(most_probable, 2) / (2**self.num_qubits)
-            confidence = max_count / self.shots
-
-            logger.info(
-                f"Phase estimated: {estimated_phase:.4f} (confidence: {confidence:.2%})",
-                extra={
-                    "phase": estimated_phase,
-                    "confidence": confidence,
-                    "prices_count": len(prices),
-                },
-            )
-
-            return {
-                "phase": estimated_phase * 2 * np.pi,  # Convert to radians
-                "confidence": confidence,
-                "measurements": counts,
-                "target_phase": target_phase,
-            }
+            counts = self._run_circuits([target_phase])[0]
+            return self._phase_result(counts, target_phase, len(prices))
 
         except Exception as e:
             logger.error(f"Phase estimation error: {e}")
@@ -186,6 +300,93 @@ class QuantumPhaseEstimator:
                 "target_phase": 0.0,
             }
 
+    def _run_circuits(self, phases: List[float]) -> List[np.ndarray]:
+        """
+        Execute one QPE circuit per target phase in a single backend job.
+
+        Args:
+            phases: Target phases to bind into the cached circuit
+
+        Returns:
+            Outcome counts for each phase, as arrays indexed by measured integer
+        """
+        # Bind each phase into the cached transpiled circuit and execute together
+        template, phase_param = self._transpiled_template()
+        circuits = [
+            template.assign_parameters({phase_param: phase}) for phase in phases
+        ]
+
+        n_outcomes = 2**self.num_qubits
+
+        if self.exact:
+            result = self._backend_run(circuits).result()
+            all_counts = []
+            for i in range(len(circuits)):
+                probabilities = np.zeros(n_outcomes)
+                for outcome, p in result.data(i)["probabilities"].items():
+                    probabilities[outcome] = p
+                all_counts.append(np.rint(probabilities * self.shots).astype(np.int64))
+            return all_counts
+
+        result = self._backend_run(circuits, shots=self.shots).result()
+        all_counts = []
+        for i in range(len(circuits)):
+            counts = result.get_counts(i)
+            outcomes = np.fromiter(
+                (int(k, 2) for k in counts), dtype=np.int64, count=len(counts)
+            )
+            values = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+            all_counts.append(
+                np.bincount(outcomes, weights=values, minlength=n_outcomes).astype(
+                    np.int64
+                )
+            )
+        return all_counts
+
+    def _phase_result(
+        self, counts: np.ndarray, target_phase: float, prices_count: int
+    ) -> dict:
+        """
+        Turn outcome counts into a phase estimate.
+
+        Args:
+            counts: Counts per measured integer from one QPE circuit
+            target_phase: Encoded input phase
+            prices_count: Number of prices that were encoded
+
+        Returns:
+            Dictionary with estimated phase and confidence
+        """
+        # Extract most probable phase
+        best = int(counts.argmax())
+        max_count = int(counts[best])
+
+        # Convert outcome to phase
+        estimated_phase = float(self._phase_table[best])
+        confidence = max_count / self.shots
+
+        # Per-circuit detail; formatting is deferred until a sink accepts DEBUG
+        logger.debug(
+            "Phase estimated: {:.4f} (confidence: {:.2%})",
+            estimated_phase,
+            confidence,
+            extra={
+                "phase": estimated_phase,
+                "confidence": confidence,
+                "prices_count": prices_count,
+            },
+        )
+
+        return {
+            "phase": float(self._phase_table_rad[best]),  # Radians
+            "confidence": confidence,
+            "measurements": {
+                format(i, f"0{self.num_qubits}b"): int(counts[i])
+                for i in np.flatnonzero(counts)
+            },
+            "target_phase": target_phase,
+        }
+
     def detect_cycle(self, prices: List[float], window: int = 20) -> dict:
         """
         Detect market cycle using rolling QPE.
@@ -210,31 +411,93 @@ class QuantumPhaseEstimator:
             recent_prices = prices[-window:]
             result = self.estimate_phase(recent_prices)
 
-            # Calculate period from phase
-            phase = result["phase"]
-            period = (2 * np.pi) / (phase + 1e-10)
-            strength = result["confidence"]
-
-            # Determine direction
-            direction = "bullish" if prices[-1] > prices[-window] else "bearish"
-
-            logger.info(
-                f"Cycle detected: period={period:.2f}, strength={strength:.2%}, {direction}",
-                extra={
-                    "period": period,
-                    "strength": strength,
-                    "direction": direction,
-                },
-            )
+            return self._cycle_result(prices, window, result)
 
-            return {
+        except Exception as e:
+            logger.error(f"Cycle detection error: {e}")
+            return {"period": 0, "strength": 0.0, "direction": "neutral"}
+
+    def detect_cycles_batch(
+        self, prices: List[float], windows: List[int]
+    ) -> List[dict]:
+        """
+        Detect market cycles for several window sizes in one QPE job.
+
+        Equivalent to calling ``detect_cycle`` once per window, but all
+        circuits are submitted to the backend together.
+
+        Args:
+            prices: Historical price data
+            windows: Rolling window sizes
+
+        Returns:
+            Cycle detection results, one per window
+
+        Example:
+            >>> cycles = qpe.detect_cycles_batch(price_history, [10, 20, 50])
+            >>> print([c['period'] for c in cycles])
+        """
+        neutral = {"period": 0, "strength": 0.0, "direction": "neutral"}
+
+        try:
+            cycles = [dict(neutral) for _ in windows]
+            pending = []
+            phases = []
+
+            for i, window in enumerate(windows):
+                if len(prices) < window:
+                    logger.warning(f"Insufficient data: {len(prices)} < {window}")
+                    continue
+
+                pending.append(i)
+                phases.append(self.encode_price_data(prices[-window:]))
+
+            if phases:
+                all_counts = self._run_circuits(phases)
+
+                for i, target_phase, counts in zip(pending, phases, all_counts):
+                    result = self._phase_result(counts, target_phase, windows[i])
+                    cycles[i] = self._cycle_result(prices, windows[i], result)
+
+            return cycles
+
+        except Exception as e:
+            logger.error(f"Cycle detection error: {e}")
+            return [dict(neutral) for _ in windows]
+
+    def _cycle_result(self, prices: List[float], window: int, result: dict) -> dict:
+        """
+        Derive cycle period, strength and direction from a phase estimate.
+
+        Args:
+            prices: Historical price data
+            window: Rolling window size the phase was estimated on
+            result: Output of the phase estimation
+
+        Returns:
+            Cycle detection results
+        """
+        # Calculate period from phase
+        phase = result["phase"]
+        period = (2 * np.pi) / (phase + 1e-10)
+        strength = result["confidence"]
+
+        # Determine direction
+        direction = "bullish" if prices[-1] > prices[-window] else "bearish"
+
+        logger.info(
+            f"Cycle detected: period={period:.2f}, strength={strength:.2%}, {direction}",
+            extra={
                 "period": period,
                 "strength": strength,
                 "direction": direction,
-                "phase": phase,
-                "confidence": result["confidence"],
-            }
+            },
+        )
 
-        except Exception as e:
-            logger.error(f"Cycle detection error: {e}")
-            return {"period": 0, "strength": 0.0, "direction": "neutral"}
+        return {
+            "period": period,
+            "strength": strength,
+            "direction": direction,
+            "phase": phase,
+            "confidence": result["confidence"],
+        }
@@ -1,16 +1,69 @@
 """Trading signal generation using quantum analysis."""
 
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
-from datetime import datetime, timezone, timezone
+from typing import Dict, List, Optional, Union
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
 import numpy as np
 import pandas as pd
 from loguru import logger
 
 from .qpe import QuantumPhaseEstimator
+from ..utils._njit import njit, NUMBA_AVAILABLE
+from ..utils._trade_scan import first_touch, TOUCH_SL, TOUCH_TP
 
+# Bars as a DataFrame or as a dict of NumPy columns (see MT5Connector.get_rates_arrays)
+PriceData = Union[pd.DataFrame, Dict[str, np.ndarray]]
 
-@dataclass
+
+@njit(cache=True)
+def _cycle_stats_nb(prices):
+    """
+    20-bar SMA, 50-bar SMA and 20-bar volatility in one compiled call.
+
+    Matches the NumPy expressions in ``_cycle_stats_np``: windows shrink to
+    the available bars, volatility is population std over SMA, and the 50-bar
+    SMA falls back to the 20-bar one when fewer than 50 prices are given.
+    """
+    n = prices.shape[0]
+    n20 = min(n, 20)
+
+    total = 0.0
+    for i in range(n - n20, n):
+        total += prices[i]
+    sma_20 = total / n20
+
+    sq_dev = 0.0
+    for i in range(n - n20, n):
+        d = prices[i] - sma_20
+        sq_dev += d * d
+    volatility = np.sqrt(sq_dev / n20) / sma_20
+
+    sma_50 = sma_20
+    if n >= 50:
+        total = 0.0
+        for i in range(n - 50, n):
+            total += prices[i]
+        sma_50 = total / 50
+
+    return sma_20, sma_50, volatility
+
+
+def _cycle_stats_np(prices):
+    """NumPy equivalent of ``_cycle_stats_nb`` used when Numba is unavailable."""
+    sma_20 = np.mean(prices[-20:])
+    sma_50 = np.mean(prices[-50:]) if len(prices) >= 50 else sma_20
+    volatility = np.std(prices[-20:]) / np.mean(prices[-20:])
+    return sma_20, sma_50, volatility
+
+
+_cycle_stats = _cycle_stats_nb if NUMBA_AVAILABLE else _cycle_stats_np
+
+_UTC = timezone.utc
+_now_utc = partial(datetime.now, _UTC)
+
+
+@dataclass(slots=True)
 class TradingSignal:
     """Trading signal data structure."""
 
@@ -28,15 +81,24 @@ class TradingSignal:
     def __post_init__(self):
         """Initialize default values."""
         if self.timestamp is None:
-            self.timestamp = datetime.now(timezone.utc)
+            self.timestamp = _now_utc()
         if self.metadata is None:
             self.metadata = {}
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
-        data = asdict(self)
-        data["timestamp"] = self.timestamp.isoformat()
-        return data
+        return {
+            "symbol": self.symbol,
+            "action": self.action,
+            "confidence": self.confidence,
+            "entry_price": self.entry_price,
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "risk_reward": self.risk_reward,
+            "timestamp": self.timestamp.isoformat(),
+            "reason": self.reason,
+            "metadata": dict(self.metadata),
+        }
 
 
 class SignalGenerator:
@@ -79,14 +141,14 @@ class SignalGenerator:
 
     def generate(
         self,
-        price_data: pd.DataFrame,
+        price_data: PriceData,
         symbol: str,
     ) -> Optional[TradingSignal]:
         """
         Generate trading signal from price data.
 
         Args:
-            price_data: DataFrame with OHLCV data
+            price_data: DataFrame or dict of column arrays with OHLCV data
             symbol: Trading symbol
 
         Returns:
@@ -98,14 +160,17 @@ class SignalGenerator:
             ...     print(f"{signal.action} {signal.symbol}")
         """
         try:
-            if len(price_data) < self.lookback_period:
+            closes = np.asarray(price_data["close"])
+
+            if len(closes) < self.lookback_period:
                 logger.warning(
-                    f"Insufficient data for {symbol}: {len(price_data)} < {self.lookback_period}"
+                    f"Insufficient data for {symbol}: "
+                    f"{len(closes)} < {self.lookback_period}"
                 )
                 return None
 
             # Extract close prices
-            prices = price_data["close"].tail(self.lookback_period).values
+            prices = closes[len(closes) - self.lookback_period :]
 
             # Detect market cycle
             cycle = self.qpe.detect_cycle(prices)
@@ -166,9 +231,9 @@ class SignalGenerator:
             phase = cycle.get("phase", 0)
 
             # Calculate technical indicators
-            sma_20 = np.mean(prices[-20:])
-            sma_50 = np.mean(prices[-50:]) if len(prices) >= 50 else sma_20
-            volatility = np.std(prices[-20:]) / np.mean(prices[-20:])
+            sma_20, sma_50, volatility = _cycle_stats(
+                np.asarray(prices, dtype=np.float64)
+            )
 
             # Signal logic
             if strength < self.confidence_threshold:
@@ -243,13 +308,13 @@ class SignalGenerator:
 
     def generate_batch(
         self,
-        symbols_data: Dict[str, pd.DataFrame],
+        symbols_data: Dict[str, PriceData],
     ) -> List[TradingSignal]:
         """
         Generate signals for multiple symbols.
 
         Args:
-            symbols_data: Dict mapping symbols to DataFrames
+            symbols_data: Dict mapping symbols to DataFrames or column-array dicts
 
         Returns:
             List of TradingSignals
@@ -278,15 +343,18 @@ class SignalGenerator:
     def backtest_signal(
         self,
         signal: TradingSignal,
-        future_data: pd.DataFrame,
+        future_data: PriceData,
         periods: int = 50,
     ) -> Dict:
         """
         Backtest signal performance.
 
+        The position exits at the first close that reaches the stop loss or
+        take profit (stop loss first if both), otherwise at the last close.
+
         Args:
             signal: Trading signal to test
-            future_data: Future price data
+            future_data: Future price data (DataFrame or dict of column arrays)
             periods: Number of periods to test
 
         Returns:
@@ -297,45 +365,34 @@ class SignalGenerator:
             >>> print(f"Win: {results['win']}, Profit: {results['profit_pct']}")
         """
         try:
-            if len(future_data) < periods:
-                periods = len(future_data)
+            closes = np.asarray(future_data["close"], dtype=np.float64)
+            if len(closes) < periods:
+                periods = len(closes)
 
-            prices = future_data["close"].head(periods).values
+            prices = closes[:periods]
             entry = signal.entry_price
-
-            if signal.action == "BUY":
-                max_price = np.max(prices)
-                min_price = np.min(prices)
-
-                hit_tp = bool(max_price >= signal.take_profit) if signal.take_profit else False
-                hit_sl = bool(min_price <= signal.stop_loss) if signal.stop_loss else False
-
-                if hit_sl:
-                    exit_price = signal.stop_loss
-                    win = False
-                elif hit_tp:
-                    exit_price = signal.take_profit
-                    win = True
-                else:
-                    exit_price = prices[-1]
-                    win = bool(exit_price > entry)
-
-            else:  # SELL
-                max_price = np.max(prices)
-                min_price = np.min(prices)
-
-                hit_tp = bool(min_price <= signal.take_profit) if signal.take_profit else False
-                hit_sl = bool(max_price >= signal.stop_loss) if signal.stop_loss else False
-
-                if hit_sl:
-                    exit_price = signal.stop_loss
-                    win = False
-                elif hit_tp:
-                    exit_price = signal.take_profit
-                    win = True
-                else:
-                    exit_price = prices[-1]
-                    win = bool(exit_price < entry)
+            is_buy = signal.action == "BUY"
+
+            # Exit at whichever level the price reaches first
+            outcome, touch_idx = first_touch(
+                prices,
+                prices,
+                float(signal.stop_loss or 0.0),
+                float(signal.take_profit or 0.0),
+                1 if is_buy else -1,
+            )
+            hit_sl = outcome == TOUCH_SL
+            hit_tp = outcome == TOUCH_TP
+
+            if hit_sl:
+                exit_price = signal.stop_loss
+                win = False
+            elif hit_tp:
+                exit_price = signal.take_profit
+                win = True
+            else:
+                exit_price = prices[-1]
+                win = bool(exit_price > entry) if is_buy else bool(exit_price < entry)
 
             profit_pct = ((exit_price - entry) / entry) * 100
             if signal.action == "SELL":
@@ -349,6 +406,7 @@ class SignalGenerator:
                 "hit_tp": hit_tp,
                 "hit_sl": hit_sl,
                 "periods": periods,
+                "periods_used": int(touch_idx) + 1,
             }
 
         except Exception as e:
@@ -0,0 +1,32 @@
+"""Optional Numba JIT support for numeric kernels.
+
+Numba is an optional dependency. When it is not installed, ``njit`` is a
+no-op decorator and ``prange`` is ``range``, so decorated kernels still run as
+plain Python. Callers that have a faster NumPy formulation should check
+``NUMBA_AVAILABLE`` and pick that path instead of the interpreted loop.
+"""
+
+from loguru import logger
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.debug("Numba not installed - JIT kernels run as plain Python")
+    NUMBA_AVAILABLE = False
+
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
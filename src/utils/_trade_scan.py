@@ -0,0 +1,84 @@
+"""First-touch stop-loss / take-profit scan shared by the backtesting paths.
+
+``first_touch`` is the Numba kernel when Numba is installed and the NumPy
+formulation otherwise. Both report which level a position reaches first and
+on which bar, with the stop loss winning when both are touched on one bar.
+"""
+
+import numpy as np
+
+from ._njit import njit, NUMBA_AVAILABLE
+
+# Outcomes returned by the scans
+NO_TOUCH, TOUCH_SL, TOUCH_TP = 0, 1, 2
+
+
+def _first_true(mask: np.ndarray) -> int:
+    """Index of the first True in a boolean array, or its length if none."""
+    idx = int(mask.argmax())
+    return idx if mask[idx] else len(mask)
+
+
+@njit(cache=True)
+def first_touch_nb(highs, lows, stop_loss, take_profit, direction):
+    """
+    Scan bars in order and report which level is touched first.
+
+    ``direction`` is 1 for BUY, -1 for SELL and 0 for no SL/TP checks. A level
+    of 0.0 means "not set". Pass the same array as ``highs`` and ``lows`` to
+    scan plain closes. Returns ``(outcome, index)``, with the last index when
+    neither level is touched.
+    """
+    n = highs.shape[0]
+    if direction != 0:
+        for i in range(n):
+            if direction > 0:
+                sl_hit = stop_loss != 0.0 and lows[i] <= stop_loss
+                tp_hit = take_profit != 0.0 and highs[i] >= take_profit
+            else:
+                sl_hit = stop_loss != 0.0 and highs[i] >= stop_loss
+                tp_hit = take_profit != 0.0 and lows[i] <= take_profit
+
+            if sl_hit:
+                return TOUCH_SL, i
+            if tp_hit:
+                return TOUCH_TP, i
+
+    return NO_TOUCH, n - 1
+
+
+def first_touch_np(highs, lows, stop_loss, take_profit, direction):
+    """NumPy equivalent of ``first_touch_nb`` used when Numba is unavailable."""
+    n = highs.shape[0]
+
+    # First bar touching each level (n if never touched)
+    sl_idx = tp_idx = n
+    if direction > 0:
+        if stop_loss:
+            sl_idx = _first_true(lows <= stop_loss)
+        if take_profit:
+            tp_idx = _first_true(highs >= take_profit)
+    elif direction < 0:
+        if stop_loss:
+            sl_idx = _first_true(highs >= stop_loss)
+        if take_profit:
+            tp_idx = _first_true(lows <= take_profit)
+
+    # SL wins ties: both touched on the same bar counts as a loss
+    if sl_idx < n and sl_idx <= tp_idx:
+        return TOUCH_SL, sl_idx
+    if tp_idx < n:
+        return TOUCH_TP, tp_idx
+    return NO_TOUCH, n - 1
+
+
+first_touch = first_touch_nb if NUMBA_AVAILABLE else first_touch_np
+
+__all__ = [
+    "NO_TOUCH",
+    "TOUCH_SL",
+    "TOUCH_TP",
+    "first_touch",
+    "first_touch_nb",
+    "first_touch_np",
+]
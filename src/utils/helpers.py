@@ -2,9 +2,13 @@
 
 from typing import Optional, Union
 from decimal import Decimal, ROUND_HALF_UP
-from datetime import datetime, timezone, timezone
+from datetime import datetime, timezone
+from functools import partial
 from loguru import logger
 
+_UTC = timezone.utc
+_now_utc = partial(datetime.now, _UTC)
+
 
 def format_currency(
     amount: Union[int, float, Decimal],
@@ -125,7 +129,7 @@ def get_utc_now() -> datetime:
         >>> print(now.tzinfo)
         UTC
     """
-    return datetime.now(timezone.utc)
+    return _now_utc()
 
 
 def format_datetime(
@@ -4,6 +4,23 @@ import re
 from typing import Optional
 from loguru import logger
 
+# Forex pairs: 6 characters (e.g., EURUSD)
+# Metals: 5-6 characters (e.g., XAUUSD, GOLD)
+# Indices: 3-8 characters (e.g., US30, NAS100)
+_SYMBOL_RE = re.compile(r"^[A-Z]{3,8}$")
+
+# RFC 5322 simplified pattern
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# Spaces, dashes, and parentheses stripped before phone validation
+_PHONE_CLEAN_RE = re.compile(r"[\s\-\(\)]")
+# South African numbers: +27XXXXXXXXX or 0XXXXXXXXX
+_PHONE_ZA_RE = re.compile(r"^(\+27|0)[6-8][0-9]{8}$")
+# Generic international format
+_PHONE_INTL_RE = re.compile(r"^\+?[1-9]\d{1,14}$")
+
+_VALID_PLANS = frozenset({"basic", "pro", "premium", "bot", "enterprise"})
+
 
 def validate_symbol(symbol: str) -> bool:
     """
@@ -24,12 +41,7 @@ def validate_symbol(symbol: str) -> bool:
     if not symbol or not isinstance(symbol, str):
         return False
 
-    # Forex pairs: 6 characters (e.g., EURUSD)
-    # Metals: 5-6 characters (e.g., XAUUSD, GOLD)
-    # Indices: 3-8 characters (e.g., US30, NAS100)
-    pattern = r"^[A-Z]{3,8}$"
-
-    is_valid = bool(re.match(pattern, symbol.upper()))
+    is_valid = _SYMBOL_RE.match(symbol.upper()) is not None
 
     if not is_valid:
         logger.warning(f"Invalid symbol format: {symbol}")
@@ -56,10 +68,7 @@ def validate_email(email: str) -> bool:
     if not email or not isinstance(email, str):
         return False
 
-    # RFC 5322 simplified pattern
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-
-    is_valid = bool(re.match(pattern, email))
+    is_valid = _EMAIL_RE.match(email) is not None
 
     if not is_valid:
         logger.warning(f"Invalid email format: {email}")
@@ -88,16 +97,10 @@ def validate_phone(phone: str, country_code: str = "ZA") -> bool:
         return False
 
     # Remove spaces, dashes, and parentheses
-    cleaned = re.sub(r"[\s\-\(\)]", "", phone)
-
-    if country_code == "ZA":
-        # South African numbers: +27XXXXXXXXX or 0XXXXXXXXX
-        pattern = r"^(\+27|0)[6-8][0-9]{8}$"
-    else:
-        # Generic international format
-        pattern = r"^\+?[1-9]\d{1,14}$"
+    cleaned = _PHONE_CLEAN_RE.sub("", phone)
 
-    is_valid = bool(re.match(pattern, cleaned))
+    pattern = _PHONE_ZA_RE if country_code == "ZA" else _PHONE_INTL_RE
+    is_valid = pattern.match(cleaned) is not None
 
     if not is_valid:
         logger.warning(f"Invalid phone format: {phone}")
@@ -175,8 +178,7 @@ def validate_plan(plan: str) -> bool:
         >>> validate_plan("invalid")
         False
     """
-    valid_plans = {"basic", "pro", "premium", "bot", "enterprise"}
-    is_valid = plan.lower() in valid_plans
+    is_valid = plan.lower() in _VALID_PLANS
 
     if not is_valid:
         logger.warning(f"Invalid plan: {plan}")
@@ -1,5 +1,7 @@
 """Pytest configuration and fixtures."""
 
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -7,6 +9,29 @@ from src.api.main import app
 from src.utils.config import get_settings
 
 
+@pytest.fixture(autouse=True)
+def qpe_cache_dir(tmp_path, monkeypatch):
+    """Keep QPE template files out of the real home-directory cache."""
+    from src.quantum_engine import qpe
+
+    monkeypatch.setattr(qpe, "_QPY_CACHE_DIR", tmp_path / "qpe")
+
+
+@pytest.fixture
+def connected_mt5(monkeypatch, tmp_path):
+    """Fake MetaTrader5 module and a connector marked as connected to it."""
+    from src.quantum_engine import mt5_connector
+
+    fake_mt5 = MagicMock()
+    monkeypatch.setattr(mt5_connector, "MT5_AVAILABLE", True)
+    monkeypatch.setattr(mt5_connector, "mt5", fake_mt5, raising=False)
+
+    connector = mt5_connector.MT5Connector(cache_ttl=60.0, cache_dir=tmp_path / "rates")
+    connector.connected = True
+
+    return fake_mt5, connector
+
+
 @pytest.fixture
 def client():
     """Create test client."""
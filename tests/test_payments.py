@@ -0,0 +1,168 @@
+"""Tests for payment processing."""
+
+import hashlib
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.database.models import Subscription, User
+from src.payments.billing import BillingService
+from src.payments.payfast import PayFastClient
+
+
+@pytest.fixture
+def payfast():
+    """PayFast client with fixed test credentials."""
+    return PayFastClient(
+        merchant_id="10000100",
+        merchant_key="46f0cd694581a",
+        passphrase="jt7NOE43FZPn",
+        sandbox=True,
+    )
+
+
+def _reference_signature(data, passphrase):
+    """Signature built the straightforward way, for comparison."""
+    param_string = "&".join(
+        f"{k}={urllib.parse.quote_plus(str(v))}" for k, v in sorted(data.items())
+    )
+    if passphrase:
+        param_string += f"&passphrase={urllib.parse.quote_plus(passphrase)}"
+    return hashlib.md5(param_string.encode()).hexdigest()
+
+
+def test_generate_signature_matches_reference(payfast):
+    """Test signature matches the PayFast parameter-string algorithm."""
+    data = {
+        "merchant_id": "10000100",
+        "amount": "1000.00",
+        "item_name": "Pro Plan Subscription",
+        "email_address": "user+test@example.com",
+    }
+
+    assert payfast.generate_signature(data) == _reference_signature(
+        data, "jt7NOE43FZPn"
+    )
+
+
+def test_payment_url_contains_signed_fields(payfast):
+    """Test payment URL carries every field plus a valid signature."""
+    url = payfast.generate_payment_url(
+        amount=1000,
+        item_name="Pro Plan Subscription",
+        email_address="user@example.com",
+        name_first="Test",
+    )
+
+    assert url.startswith("https://sandbox.payfast.co.za/eng/process?")
+
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+    signature = params.pop("signature")
+
+    assert params["merchant_id"] == "10000100"
+    assert params["amount"] == "1000.00"
+    assert params["item_name"] == "Pro Plan Subscription"
+    assert signature == _reference_signature(params, "jt7NOE43FZPn")
+
+
+def test_verify_payment(payfast):
+    """Test ITN verification accepts valid and rejects tampered data."""
+    data = {"m_payment_id": "pay-1", "amount_gross": "500.00"}
+    post_data = {**data, "signature": payfast.generate_signature(data)}
+
+    assert payfast.verify_payment(post_data) is True
+
+    tampered = {**post_data, "amount_gross": "1.00", "m_payment_id": "pay-2"}
+    assert payfast.verify_payment(tampered) is False
+
+
+def test_process_due_subscriptions_batches_queries():
+    """Test billing run fetches users and updates dates in bulk."""
+    now = datetime.now(timezone.utc)
+    user = User(email="trader@example.com", name="Test Trader")
+    subs = [
+        Subscription(
+            user_id=user.id,
+            plan="pro",
+            monthly_fee=1000.0,
+            current_period_end=now,
+            next_billing_date=now,
+        ),
+        Subscription(
+            user_id=uuid4(),  # orphaned subscription
+            plan="basic",
+            monthly_fee=500.0,
+            current_period_end=now,
+            next_billing_date=now,
+        ),
+    ]
+
+    billing = BillingService()
+    billing.sub_queries = MagicMock()
+    billing.user_queries = MagicMock()
+    billing.sub_queries.get_due_subscriptions.return_value = subs
+    billing.user_queries.get_users_by_ids.return_value = [user]
+    billing.sub_queries.bulk_update_next_billing.return_value = 1
+
+    assert billing.process_due_subscriptions() == 1
+
+    billing.user_queries.get_users_by_ids.assert_called_once()
+    billing.user_queries.get_user_by_id.assert_not_called()
+    billing.sub_queries.update_subscription.assert_not_called()
+    billing.sub_queries.bulk_update_next_billing.assert_called_once_with(
+        [(subs[0].id, now + timedelta(days=30))]
+    )
+
+
+def test_process_due_subscriptions_isolates_failures():
+    """Test one failing renewal does not stop the others from advancing."""
+    now = datetime.now(timezone.utc)
+    users = [User(email=f"trader{i}@example.com") for i in range(2)]
+    subs = [
+        Subscription(
+            user_id=user.id,
+            plan="pro",
+            monthly_fee=1000.0,
+            current_period_end=now,
+            next_billing_date=now,
+        )
+        for user in users
+    ]
+
+    billing = BillingService()
+    billing.sub_queries = MagicMock()
+    billing.user_queries = MagicMock()
+    billing.payfast = MagicMock()
+    billing.sub_queries.get_due_subscriptions.return_value = subs
+    billing.user_queries.get_users_by_ids.return_value = users
+    billing.payfast.create_subscription_payment.side_effect = [
+        RuntimeError("gateway down"),
+        "https://sandbox.payfast.co.za/eng/process?x=1",
+    ]
+    billing.sub_queries.bulk_update_next_billing.return_value = 1
+
+    assert billing.process_due_subscriptions() == 1
+    billing.sub_queries.bulk_update_next_billing.assert_called_once_with(
+        [(subs[1].id, now + timedelta(days=30))]
+    )
+
+
+def test_bulk_update_next_billing_falls_back_without_rpc():
+    """Test next billing dates are updated per row when the RPC is missing."""
+    from src.database.queries import SubscriptionQueries
+
+    queries = SubscriptionQueries.__new__(SubscriptionQueries)
+    queries.db = MagicMock()
+    queries.db.execute_rpc.return_value = None
+    queries.update_subscription = MagicMock(return_value=object())
+
+    now = datetime.now(timezone.utc)
+    ids = [uuid4(), uuid4()]
+
+    assert queries.bulk_update_next_billing([(i, now) for i in ids]) == 2
+    queries.update_subscription.assert_any_call(
+        str(ids[0]), {"next_billing_date": now.isoformat()}
+    )
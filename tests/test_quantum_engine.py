@@ -1,7 +1,24 @@
 """Tests for quantum trading engine."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
 import pytest
 from src.quantum_engine import QuantumPhaseEstimator, SignalGenerator, MT5Connector
+from src.quantum_engine import qpe as qpe_module
+from src.quantum_engine.backtester import Backtester, _compound_balances
+from src.quantum_engine.qpe import _encode_prices_nb
+from src.quantum_engine.signal_generator import (
+    TradingSignal,
+    _cycle_stats_nb,
+    _cycle_stats_np,
+)
+from src.utils import _trade_scan
 
 
 def test_qpe_initialization():
@@ -21,6 +38,47 @@ def test_qpe_encode_price_data():
     assert 0 <= phase <= 2 * 3.14159
 
 
+def test_qpe_encode_kernel_matches_numpy():
+    """Test the streamed phase encoding equals the normalize-then-mean form."""
+    rng = np.random.default_rng(3)
+    prices = 1.1 * np.cumprod(1 + rng.normal(0, 0.002, 50))
+
+    returns = np.diff(prices) / prices[:-1]
+    normalized = (returns - returns.min()) / (returns.max() - returns.min() + 1e-10)
+
+    assert _encode_prices_nb(prices) == pytest.approx(np.mean(normalized) * 2 * np.pi)
+
+
+def test_qpe_detect_cycles_batch():
+    """Test batched cycle detection returns one result per window."""
+    qpe = QuantumPhaseEstimator(num_qubits=4)
+    prices = list(1.1 * np.cumprod(1 + np.random.default_rng(5).normal(0, 0.002, 60)))
+
+    cycles = qpe.detect_cycles_batch(prices, [10, 20, 100])
+
+    assert len(cycles) == 3
+    for cycle in cycles[:2]:
+        assert cycle["direction"] in ("bullish", "bearish")
+        assert 0.0 < cycle["strength"] <= 1.0
+    assert cycles[2] == {"period": 0, "strength": 0.0, "direction": "neutral"}
+
+
+def test_qpe_template_disk_cache(monkeypatch, tmp_path):
+    """Test a template loaded from the QPY cache gives the same estimate."""
+    monkeypatch.setattr(qpe_module, "_QPY_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(qpe_module, "_TEMPLATE_CACHE", {})
+    prices = list(np.linspace(1.10, 1.12, 20))
+
+    built = QuantumPhaseEstimator(num_qubits=4).estimate_phase(prices)
+    assert len(list(tmp_path.glob("*.qpy"))) == 1
+
+    monkeypatch.setattr(qpe_module, "_TEMPLATE_CACHE", {})
+    loaded = QuantumPhaseEstimator(num_qubits=4).estimate_phase(prices)
+
+    assert loaded["phase"] == built["phase"]
+    assert loaded["measurements"] == built["measurements"]
+
+
 def test_signal_generator_initialization():
     """Test signal generator initialization."""
     generator = SignalGenerator(confidence_threshold=0.75)
@@ -39,6 +97,34 @@ def test_signal_generation(mock_price_data):
         assert 0 <= signal.confidence <= 1.0
 
 
+@pytest.mark.parametrize("n", [10, 20, 49, 100])
+def test_cycle_stats_kernels_agree(n):
+    """Test the compiled and NumPy cycle statistics match."""
+    prices = 1.1 * np.cumprod(1 + np.random.default_rng(n).normal(0, 0.002, n))
+
+    assert _cycle_stats_nb(prices) == pytest.approx(_cycle_stats_np(prices))
+
+
+def test_backtest_signal_uses_first_touch():
+    """Test a take profit reached before the stop loss counts as a win."""
+    signal = TradingSignal(
+        symbol="EURUSD",
+        action="BUY",
+        confidence=0.9,
+        entry_price=1.10,
+        stop_loss=1.09,
+        take_profit=1.12,
+    )
+    closes = np.array([1.105, 1.121, 1.095, 1.085])
+
+    result = SignalGenerator().backtest_signal(signal, {"close": closes})
+
+    assert result["win"] is True
+    assert result["hit_tp"] and not result["hit_sl"]
+    assert result["exit"] == pytest.approx(1.12)
+    assert result["periods_used"] == 2
+
+
 def test_mt5_connector_mock_data():
     """Test MT5 connector with mock data."""
     connector = MT5Connector()
@@ -47,3 +133,246 @@ def test_mt5_connector_mock_data():
     assert len(data) == 100
     assert "close" in data.columns
     assert "open" in data.columns
+    assert str(data["time"].dt.tz) == "UTC"
+    assert connector._generate_mock_arrays("EURUSD", 5)["time"].dtype.kind == "M"
+
+
+def test_mt5_current_price_uses_tick_cache(connected_mt5):
+    """Test repeated price lookups within the TTL reuse one MT5 tick."""
+    fake_mt5, connector = connected_mt5
+    fake_mt5.symbol_info_tick.return_value = SimpleNamespace(
+        bid=1.1, ask=1.1002, time=1700000000
+    )
+
+    first = connector.get_current_price("EURUSD")
+    second = connector.get_current_price("EURUSD")
+
+    assert first == second
+    assert fake_mt5.symbol_info_tick.call_count == 1
+
+    connector.disconnect()
+    connector.connected = True
+    connector.get_current_price("EURUSD")
+
+    assert fake_mt5.symbol_info_tick.call_count == 2
+
+
+def test_mt5_rates_disk_cache(connected_mt5):
+    """Test cached rates are served from disk while the last bar is current."""
+    now = int(time.time()) // 3600 * 3600
+    rates = np.zeros(5, dtype=[("time", "<i8"), ("close", "<f8")])
+    rates["time"] = now - 3600 * np.arange(4, -1, -1)
+    rates["close"] = np.linspace(1.1, 1.2, 5)
+
+    fake_mt5, connector = connected_mt5
+    fake_mt5.copy_rates_from_pos.return_value = rates
+
+    first = connector.get_rates("EURUSD", "H1", 5, use_cache=True)
+    second = connector.get_rates("EURUSD", "H1", 3, use_cache=True)
+
+    assert fake_mt5.copy_rates_from_pos.call_count == 1
+    assert second["close"].tolist() == first["close"].tail(3).tolist()
+
+    connector.get_rates("EURUSD", "H1", 5)
+    assert fake_mt5.copy_rates_from_pos.call_count == 2
+
+
+def test_mt5_rates_cache_drops_non_overlapping_history(connected_mt5):
+    """Test a fetch that leaves a gap replaces the cached bars."""
+    now = int(time.time()) // 3600 * 3600
+    stale = np.zeros(100, dtype=[("time", "<i8"), ("close", "<f8")])
+    stale["time"] = now - 96 * 3600 - 3600 * np.arange(99, -1, -1)
+    fresh = np.zeros(5, dtype=[("time", "<i8"), ("close", "<f8")])
+    fresh["time"] = now - 3600 * np.arange(4, -1, -1)
+
+    fake_mt5, connector = connected_mt5
+    fake_mt5.copy_rates_from_pos.side_effect = [stale, fresh, fresh]
+
+    connector.get_rates("EURUSD", "H1", 100, use_cache=True)
+    connector.get_rates("EURUSD", "H1", 5, use_cache=True)
+    connector.get_rates("EURUSD", "H1", 50, use_cache=True)
+
+    assert fake_mt5.copy_rates_from_pos.call_count == 3
+
+
+def test_mt5_rates_calls_are_serialized(connected_mt5):
+    """Test concurrent rate fetches never overlap inside the MT5 package."""
+    active = []
+    overlap = threading.Event()
+    rates = np.zeros(5, dtype=[("time", "<i8"), ("close", "<f8")])
+
+    def copy_rates(*args):
+        active.append(1)
+        if len(active) > 1:
+            overlap.set()
+        time.sleep(0.01)
+        active.pop()
+        return rates
+
+    fake_mt5, connector = connected_mt5
+    fake_mt5.copy_rates_from_pos.side_effect = copy_rates
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(connector.get_rates_arrays, ["A", "B", "C", "D"]))
+
+    assert fake_mt5.copy_rates_from_pos.call_count == 4
+    assert not overlap.is_set()
+
+
+def test_mt5_symbols_cached_until_disconnect(connected_mt5):
+    """Test the symbol list is fetched once per session."""
+    fake_mt5, connector = connected_mt5
+    fake_mt5.symbols_get.return_value = [
+        SimpleNamespace(name="EURUSD"),
+        SimpleNamespace(name="XAUUSD"),
+    ]
+
+    assert connector.get_symbols() == ["EURUSD", "XAUUSD"]
+    assert connector.is_valid_symbol("XAUUSD")
+    assert not connector.is_valid_symbol("BTCUSD")
+    assert fake_mt5.symbols_get.call_count == 1
+
+    connector.disconnect()
+    connector.connected = True
+    connector.get_symbols()
+
+    assert fake_mt5.symbols_get.call_count == 2
+
+
+def _bars(highs, lows, closes):
+    """Build hourly OHLC bars starting 2024-01-01 00:00."""
+    return pd.DataFrame(
+        {
+            "time": pd.date_range("2024-01-01", periods=len(closes), freq="h"),
+            "open": closes,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+        }
+    )
+
+
+def _signal(**overrides):
+    """BUY EURUSD at 1.10 with SL 1.09 / TP 1.11, placed at 2024-01-01 00:00."""
+    fields = {
+        "symbol": "EURUSD",
+        "action": "BUY",
+        "confidence": 0.9,
+        "entry_price": 1.10,
+        "stop_loss": 1.09,
+        "take_profit": 1.11,
+        "timestamp": datetime(2024, 1, 1, 0),
+    }
+    fields.update(overrides)
+    return TradingSignal(**fields)
+
+
+def test_backtester_first_touch_exits():
+    """Test trades exit at the first bar touching SL or TP."""
+    n = 20
+    closes = [1.10] * n
+    highs = [1.101] * n
+    lows = [1.099] * n
+    highs[5] = 1.111  # BUY take profit on bar 5
+    lows[8] = 1.089  # SELL take profit on bar 8
+
+    buy = _signal()
+    sell = _signal(
+        action="SELL",
+        stop_loss=1.11,
+        take_profit=1.09,
+        timestamp=datetime(2024, 1, 1, 6),
+    )
+
+    backtester = Backtester(initial_balance=10000.0, risk_per_trade=0.01)
+    results = backtester.run([buy, sell], _bars(highs, lows, closes))
+
+    assert results["total_trades"] == 2
+    assert results["winning_trades"] == 2
+    assert [t["exit"] for t in results["trades"]] == [1.11, 1.09]
+
+    # Risking 1% with a 1:1 stop distance wins 1% per trade, compounded
+    assert results["trades"][0]["profit"] == pytest.approx(100.0)
+    assert results["trades"][1]["profit"] == pytest.approx(101.0)
+    assert results["final_balance"] == pytest.approx(10201.0)
+    assert results["max_drawdown"] == 0.0
+
+
+def test_backtester_skips_non_numeric_levels():
+    """Test signals with non-numeric price levels are skipped, not fatal."""
+    n = 20
+    good = _signal()
+    bad = _signal(take_profit="n/a", timestamp=datetime(2024, 1, 1, 1))
+
+    results = Backtester().run([good, bad], _bars([1.111] * n, [1.099] * n, [1.10] * n))
+
+    assert results["total_trades"] == 1
+
+
+def test_backtester_stop_loss_wins_ties():
+    """Test SL takes precedence when SL and TP touch on the same bar."""
+    n = 15
+    closes = [1.10] * n
+    highs = [1.101] * n
+    lows = [1.099] * n
+    highs[3], lows[3] = 1.111, 1.089
+
+    results = Backtester(risk_per_trade=0.01).run(
+        [_signal()], _bars(highs, lows, closes)
+    )
+
+    trade = results["trades"][0]
+    assert trade["exit"] == 1.09
+    assert not trade["win"]
+    assert results["max_drawdown"] == pytest.approx(0.01)
+
+
+def test_backtester_exits_at_last_close_without_touch():
+    """Test trades without SL/TP touch exit at the final close."""
+    n = 15
+    closes = [1.10] * (n - 1) + [1.105]
+    highs = [c + 0.001 for c in closes]
+    lows = [c - 0.001 for c in closes]
+
+    signal = _signal(action="SELL", stop_loss=1.12, take_profit=1.08)
+
+    results = Backtester().run([signal], _bars(highs, lows, closes))
+
+    trade = results["trades"][0]
+    assert trade["exit"] == pytest.approx(1.105)
+    assert not trade["win"]
+
+
+def test_first_touch_kernels_agree():
+    """Test the shared Numba and NumPy first-touch scans agree on bar and level."""
+    rng = np.random.default_rng(7)
+    closes = 1.1 * np.cumprod(1 + rng.normal(0, 0.002, 200))
+    highs = closes * (1 + rng.uniform(0, 0.002, 200))
+    lows = closes * (1 - rng.uniform(0, 0.002, 200))
+
+    levels = [(1.09, 1.12), (1.12, 1.09), (0.0, 1.11), (1.09, 0.0)]
+
+    for bar_highs, bar_lows in ((highs, lows), (closes, closes)):
+        for direction in (1, -1, 0):
+            for stop_loss, take_profit in levels:
+                args = (bar_highs, bar_lows, stop_loss, take_profit, direction)
+                nb = _trade_scan.first_touch_nb(*args)
+                np_ = _trade_scan.first_touch_np(*args)
+
+                assert (int(nb[0]), int(nb[1])) == (int(np_[0]), int(np_[1]))
+
+
+@pytest.mark.parametrize("risk", [0.02, 1.0])
+def test_compound_balances_matches_sequential_sizing(risk):
+    """Test closed-form compounding equals trade-by-trade position sizing."""
+    unit_profits = np.array([0.01, -0.01, 0.02, 0.0, -0.005, 0.03])
+    stop_distances = np.array([0.01, 0.01, 0.0, 0.01, 0.005, 0.015])
+
+    expected = [10000.0]
+    for unit, stop in zip(unit_profits, stop_distances):
+        size = expected[-1] * risk / stop if stop > 0 else 1.0
+        expected.append(expected[-1] + unit * size - 1.5)
+
+    balances = _compound_balances(unit_profits, stop_distances, 10000.0, risk, 1.5)
+
+    assert balances == pytest.approx(expected)